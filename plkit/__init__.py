@@ -1,35 +1,117 @@
 """A package for automating EUBC PlayerLayer kit orders"""
 
+import importlib
 import importlib.metadata
+import typing
 
-from .read_orders import read_order, extract_orders
-from .generate_order_form import (
-    generate_product_order,
-    generate_product_personalisations
-)
-from .validate import (
-    assert_order_count,
-    assert_back_personalisations,
-    assert_sleeve_personalisations,
-    count_initial_order,
-    count_initial_back_personalisations,
-    count_initial_sleeve_personalisations,
-    count_processed_order,
-    count_processed_back_personalisations,
-    count_processed_sleeve_personalisations
-)
+if typing.TYPE_CHECKING:
+    from .read_orders import (
+        read_order,
+        extract_orders,
+        compact_orders,
+        extract_order_lines,
+        price_orders,
+        orders_between
+    )
+    from .confirmations import generate_confirmations
+    from .search import search_orders
+    from .diff import diff_exports
+    from .history import archive_orders, query_history
+    from .reconcile import reconcile_invoice
+    from .payments import match_payments
+    from .workbook import inspect_workbook
+    from .generate_order_form import (
+        generate_product_order,
+        generate_product_personalisations,
+        generate_print_runs
+    )
+    from .validate import (
+        assert_order_count,
+        assert_back_personalisations,
+        assert_sleeve_personalisations,
+        count_initial_order,
+        count_initial_back_personalisations,
+        count_initial_sleeve_personalisations,
+        count_processed_order,
+        count_processed_back_personalisations,
+        count_processed_sleeve_personalisations,
+        validate_orders
+    )
 
 try:
     __version__ = importlib.metadata.version("plkit")
 except importlib.metadata.PackageNotFoundError:  # pragma: no cover
     __version__ = "0+unknown"
 
+# Submodule providing each public function. These are imported on first
+# access so that the pandas-free parts of plkit (plkit.lite) start quickly.
+_EXPORTS = {
+    "read_order": "read_orders",
+    "extract_orders": "read_orders",
+    "compact_orders": "read_orders",
+    "extract_order_lines": "read_orders",
+    "price_orders": "read_orders",
+    "orders_between": "read_orders",
+    "generate_confirmations": "confirmations",
+    "search_orders": "search",
+    "diff_exports": "diff",
+    "archive_orders": "history",
+    "query_history": "history",
+    "reconcile_invoice": "reconcile",
+    "match_payments": "payments",
+    "inspect_workbook": "workbook",
+    "generate_product_order": "generate_order_form",
+    "generate_product_personalisations": "generate_order_form",
+    "generate_print_runs": "generate_order_form",
+    "assert_order_count": "validate",
+    "assert_back_personalisations": "validate",
+    "assert_sleeve_personalisations": "validate",
+    "count_initial_order": "validate",
+    "count_initial_back_personalisations": "validate",
+    "count_initial_sleeve_personalisations": "validate",
+    "count_processed_order": "validate",
+    "count_processed_back_personalisations": "validate",
+    "count_processed_sleeve_personalisations": "validate",
+    "validate_orders": "validate",
+}
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+
+    try:
+        return importlib.import_module(f".{name}", __name__)
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+
 __all__ = [
     "__version__",
     "read_order",
     "extract_orders",
+    "compact_orders",
+    "extract_order_lines",
+    "price_orders",
+    "orders_between",
+    "generate_confirmations",
+    "search_orders",
+    "diff_exports",
+    "archive_orders",
+    "query_history",
+    "reconcile_invoice",
+    "match_payments",
+    "inspect_workbook",
     "generate_product_order",
     "generate_product_personalisations",
+    "generate_print_runs",
     "assert_order_count",
     "assert_back_personalisations",
     "assert_sleeve_personalisations",
@@ -39,4 +121,5 @@ __all__ = [
     "count_processed_order",
     "count_processed_back_personalisations",
     "count_processed_sleeve_personalisations",
+    "validate_orders",
 ]
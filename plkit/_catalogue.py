@@ -0,0 +1,128 @@
+"""
+Internal constants and helpers describing the Microsoft form layout and the
+PlayerLayer product catalogue. Kept free of pandas/numpy imports so that it
+can be shared by every part of the package.
+"""
+
+import re as _re
+import unicodedata as _unicodedata
+
+# Ordinal prefixes used by the five item slots on the form
+ORDINALS = ["First", "Second", "Third", "Fourth", "Fifth"]
+
+ITEM_COLUMNS = [f"{n_item} kit item" for n_item in ORDINALS]
+
+SIZING_COLUMNS = [
+    (
+        f"Sizing for {n_item.lower()} kit item (note that "
+        "for women's tee, XS=size 6, S=size 8, ... , 4XL=20)"
+    )
+    for n_item in ORDINALS
+]
+
+BACK_NAME_COLUMNS = [
+    f"{n_item} item - name personalisation for back (optional)"
+    for n_item in ORDINALS
+]
+
+SLEEVE_NAME_COLUMNS = [
+    f"{n_item} item - personalisation for initials (optional, max two letters)"
+    for n_item in ORDINALS
+]
+
+# Every column of the form read by plkit
+ORDER_COLUMNS = (
+    ["Name", "Email"]
+    + ITEM_COLUMNS
+    + SIZING_COLUMNS
+    + BACK_NAME_COLUMNS
+    + SLEEVE_NAME_COLUMNS
+)
+
+SIZES = ["XS", "S", "M", "L", "XL", "2XL", "3XL", "4XL", "5XL"]
+
+# Women's tees are sized numerically by the supplier
+WOMENS_SIZING = {
+    "XS": 6,
+    "S": 8,
+    "M": 10,
+    "L": 12,
+    "XL": 14,
+    "2XL": 16,
+    "3XL": 18,
+    "4XL": 20,
+    "5XL": 22,
+}
+
+# Unit pricing including VAT
+PRICING = {
+    "Unisex EcoLayer Hoodie": 38.40,  # pounds
+    "Unisex EcoLayer Hoodie - 1 Personalisation": 42.60,
+    "Unisex EcoLayer Hoodie - 2 Personalisations": 46.80,
+    "Unisex Shield Performance Sweatshirt": 36.0,
+    "Unisex Shield Performance Sweatshirt - 1 Personalisation": 40.20,
+    "Unisex Shield Performance Sweatshirt - 2 Personalisations": 44.40,
+    "Men's EcoLayer Tee (Navy)": 18.60,
+    "Men's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
+    "Men's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
+    "Men's EcoLayer Tee (Forest)": 18.60,
+    "Men's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
+    "Men's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
+    "Women's EcoLayer Tee (Navy)": 18.60,
+    "Women's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
+    "Women's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
+    "Women's EcoLayer Tee (Forest)": 18.60,
+    "Women's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
+    "Women's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
+    "Men's Sublimated Tee (Navy)": 25.62,
+    "Men's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
+    "Men's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
+    "Men's Sublimated Tee (Forest)": 25.62,
+    "Men's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
+    "Men's Sublimated Tee - 2 Personalisations (Forest)": 25.62,
+    "Women's Sublimated Tee (Navy)": 25.62,
+    "Women's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
+    "Women's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
+    "Women's Sublimated Tee (Forest)": 25.62,
+    "Women's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
+    "Women's Sublimated Tee - 2 Personalisations (Forest)": 25.62,
+}
+
+# Products without any personalisation suffix, i.e. the orderable kit items
+BASE_PRODUCTS = [product for product in PRICING if " - " not in product]
+
+
+def clean_string(s):
+    """Internal function to clean and normalise a string imported from excel."""
+    if isinstance(s, str):
+        # Remove spacing characters
+        s = s.replace('\xa0', ' ')
+        # Remove other common invisible characters
+        s = _re.sub(r'[\u200B-\u200D\uFEFF\u00AD]', '', s)
+        # Normalize and strip whitespace
+        s = _unicodedata.normalize('NFKC', s).strip()
+    return s
+
+
+def product_name(item: str, n_personalisations: int) -> str:
+    """
+    Internal function to convert a kit item from the form into the supplier
+    product name, given the number of personalisations on the item
+    """
+    suffix = {
+        0: "",
+        1: " - 1 Personalisation",
+        2: " - 2 Personalisations",
+    }[n_personalisations]
+
+    # Replace 'Green' with 'Forest'
+    product = (item + suffix).replace("Green", "Forest")
+
+    # Move colour to the end of the product name
+    name = product
+    for colour in ["Forest", "Navy"]:
+        if f"({colour})" in product:
+            name = product.replace(f"({colour})", "").strip() + f" ({colour})"
+
+    # Clean up double spacing in product name
+    return name.replace("  ", " ").strip()
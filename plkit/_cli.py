@@ -1,9 +1,294 @@
 """A CLI for ``plkit``."""
 
+import os
+
 import click
 
 
-@click.command
+@click.group
 def main():
     """A package for automating EUBC PlayerLayer kit orders"""
     pass
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="Directory to write the order sheets to",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "xlsx"]),
+    default="csv",
+    help="File format of the order sheets",
+)
+@click.option(
+    "--pandas",
+    "use_pandas",
+    is_flag=True,
+    help="Process CSV exports with pandas rather than the lightweight core",
+)
+@click.option(
+    "--print-runs",
+    is_flag=True,
+    help="Also write the personalisations grouped into print runs",
+)
+@click.option(
+    "--start",
+    default=None,
+    help="Only include orders completed at or after this date/time",
+)
+@click.option(
+    "--end",
+    default=None,
+    help="Only include orders completed before this date/time, e.g. the "
+    "supplier cutoff",
+)
+def generate(filename, output_dir, fmt, use_pandas, print_runs, start, end):
+    """Generate the product and personalisation order sheets from FILENAME"""
+    os.makedirs(output_dir, exist_ok=True)
+
+    products_file = os.path.join(output_dir, f"products.{fmt}")
+    personalisations_file = os.path.join(output_dir, f"personalisations.{fmt}")
+
+    # CSV in, CSV out never needs pandas
+    lightweight = filename.endswith(".csv") and fmt == "csv"
+    windowed = start is not None or end is not None
+    if lightweight and not (use_pandas or print_runs or windowed):
+        from . import lite
+
+        orders = lite.extract_orders(filename)
+        lite.write_csv(
+            lite.generate_product_order(orders), products_file, lite.PRODUCT_COLUMNS
+        )
+        lite.write_csv(
+            lite.generate_product_personalisations(orders),
+            personalisations_file,
+            lite.PERSONALISATION_COLUMNS,
+        )
+
+    else:
+        from .generate_order_form import (
+            generate_print_runs,
+            generate_product_order,
+            generate_product_personalisations,
+        )
+        from .read_orders import extract_orders, orders_between
+
+        df_orders = extract_orders(filename)
+        if windowed:
+            df_orders = orders_between(df_orders, start, end)
+        df_personal = generate_product_personalisations(df_orders)
+
+        outputs = [
+            (generate_product_order(df_orders), products_file),
+            (df_personal, personalisations_file),
+        ]
+
+        if print_runs:
+            df_runs, df_summary = generate_print_runs(df_personal)
+            outputs += [
+                (df_runs, os.path.join(output_dir, f"print_runs.{fmt}")),
+                (df_summary, os.path.join(output_dir, f"print_run_summary.{fmt}")),
+            ]
+
+        for df, output_file in outputs:
+            if fmt == "csv":
+                df.to_csv(output_file, index=False)
+            else:
+                df.to_excel(output_file, index=False)
+
+    click.echo(f"Wrote {products_file} and {personalisations_file}")
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.option("--host", default="127.0.0.1", help="Address to bind the server to")
+@click.option("--port", default=8000, type=int, help="Port to listen on")
+@click.option(
+    "--interval",
+    default=2.0,
+    type=float,
+    help="Seconds between checks of FILENAME for changes",
+)
+def serve(filename, host, port, interval):
+    """Answer order queries for FILENAME over a local HTTP/JSON API"""
+    import logging
+
+    from .serve import serve as _serve
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    click.echo(f"Serving orders from {filename} on http://{host}:{port}")
+
+    _serve(filename, host=host, port=port, interval=interval)
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="Directory to write the order sheets to",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "xlsx"]),
+    default="csv",
+    help="File format of the order sheets",
+)
+@click.option(
+    "--interval",
+    default=2.0,
+    type=float,
+    help="Seconds between checks of FILENAME for changes",
+)
+def watch(filename, output_dir, fmt, interval):
+    """Regenerate the order sheets whenever FILENAME changes"""
+    from .pipeline import watch as _watch
+
+    def _report(pipeline):
+        stages = ", ".join(pipeline.recomputed) or "nothing"
+        click.echo(f"Processed {filename}: recomputed {stages}")
+
+    click.echo(f"Watching {filename} for changes")
+    _watch(
+        filename,
+        output_dir=output_dir,
+        fmt=fmt,
+        interval=interval,
+        callback=_report,
+    )
+
+
+@main.command
+@click.argument("old", type=click.Path(exists=True, dir_okay=False))
+@click.argument("new", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="Directory to write changes.csv and delta.csv to",
+)
+def diff(old, new, output_dir):
+    """Compare the exports OLD and NEW, writing the changed responses and
+    the change in product counts"""
+    from .diff import diff_exports
+
+    df_changes, df_delta = diff_exports(old, new)
+
+    os.makedirs(output_dir, exist_ok=True)
+    df_changes.to_csv(os.path.join(output_dir, "changes.csv"), index=False)
+    df_delta.to_csv(os.path.join(output_dir, "delta.csv"), index=False)
+
+    for status in ["added", "changed", "removed"]:
+        click.echo(f"{status}: {int((df_changes['Status'] == status).sum())}")
+    click.echo(f"Change in items: {df_delta['Total Quantity'].iloc[-1]}")
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False),
+    default="history",
+    help="Directory holding the order history dataset",
+)
+@click.option("--campaign", required=True, help="Name of the campaign")
+@click.option(
+    "--year", type=int, default=None, help="Year of the campaign [default: this year]"
+)
+def archive(filename, root, campaign, year):
+    """Add the order lines of FILENAME to the order history, replacing any
+    previously archived lines of the same campaign"""
+    from .history import archive_orders
+
+    n_lines = archive_orders(filename, root, campaign, year)
+
+    click.echo(f"Archived {n_lines} order lines of {campaign} to {root}")
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.argument("invoice", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="Directory to write reconciliation.csv to",
+)
+def reconcile(filename, invoice, output_dir):
+    """Check the supplier's INVOICE against the product order generated
+    from FILENAME"""
+    from .generate_order_form import generate_product_order
+    from .read_orders import extract_orders
+    from .reconcile import reconcile_invoice
+
+    df_reconciled = reconcile_invoice(
+        invoice, generate_product_order(extract_orders(filename))
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, "reconciliation.csv")
+    df_reconciled.to_csv(output_file, index=False)
+
+    for status, count in df_reconciled["Status"].value_counts(sort=False).items():
+        click.echo(f"{status}: {count}")
+    click.echo(f"Wrote {output_file}")
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+@click.argument("payments", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output-dir",
+    "-o",
+    type=click.Path(file_okay=False),
+    default=".",
+    help="Directory to write the paid, underpaid, overpaid, unpaid and "
+    "unmatched lists to",
+)
+def payments(filename, payments, output_dir):
+    """Match the PAYMENTS export against the order totals from FILENAME"""
+    from .payments import match_payments
+    from .read_orders import extract_orders
+
+    matches = match_payments(extract_orders(filename), payments)
+
+    os.makedirs(output_dir, exist_ok=True)
+    for status, df in matches.items():
+        df.to_csv(os.path.join(output_dir, f"{status}.csv"), index=False)
+        click.echo(f"{status}: {len(df)}")
+
+
+@main.command
+@click.argument("filename", type=click.Path(exists=True, dir_okay=False))
+def inspect(filename):
+    """Check that FILENAME has the columns plkit needs, reading only the
+    header row and the number of responses"""
+    from .workbook import inspect_workbook
+
+    report = inspect_workbook(filename)
+
+    if report["sheet"] is not None:
+        click.echo(f"Sheet: {report['sheet']}")
+    click.echo(f"Responses: {report['rows']}")
+    click.echo(f"Columns: {len(report['columns'])}")
+
+    for column in report["missing"]:
+        if column in report["renamed"]:
+            click.echo(f"Missing: {column} (renamed to {report['renamed'][column]}?)")
+        else:
+            click.echo(f"Missing: {column}")
+
+    if report["missing"]:
+        raise SystemExit(1)
@@ -0,0 +1,15 @@
+"""
+Internal helpers for reading numbers typed into spreadsheets, shared by the
+modules reading supplier invoices and payment exports
+"""
+
+import pandas as _pd
+
+
+def parse_amounts(values: _pd.Series) -> _pd.Series:
+    """Internal function to read amounts such as '£1,234.50' as numbers,
+    leaving anything which is not a number as NaN"""
+    return _pd.to_numeric(
+        values.astype(str).str.replace(r"[£$€,\s]", "", regex=True),
+        errors="coerce",
+    )
@@ -0,0 +1,212 @@
+"""
+Functions for generating an order confirmation for every respondent, listing
+their items, sizes, personalisations and the total price of their order
+"""
+
+import csv as _csv
+import html as _html
+import io as _io
+import os as _os
+import re as _re
+import string as _string
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+
+import pandas as _pd
+
+from ._catalogue import PRICING as _PRICING
+from .read_orders import extract_order_lines as _extract_order_lines
+from .read_orders import price_orders as _price_orders
+
+_TEXT_TEMPLATE = _string.Template(
+    """Order confirmation for $name ($email)
+
+$lines
+Total: £$total
+"""
+)
+
+_TEXT_LINE = _string.Template("- $product, size $size$personalisation: £$price")
+
+_HTML_TEMPLATE = _string.Template(
+    """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Order confirmation for $name</title></head>
+<body>
+<h1>Order confirmation for $name</h1>
+<p>$email</p>
+<table>
+<tr>
+<th>Product</th><th>Size</th><th>Back name</th><th>Initials</th><th>Price (£)</th>
+</tr>
+$lines
+</table>
+<p><strong>Total: £$total</strong></p>
+</body>
+</html>
+"""
+)
+
+_HTML_LINE = _string.Template(
+    "<tr><td>$product</td><td>$size</td><td>$back_name</td>"
+    "<td>$initials</td><td>$price</td></tr>"
+)
+
+_CSV_COLUMNS = ["Product", "Size", "Back Name", "Initials", "Price (£)"]
+
+
+def _text(value) -> str:
+    """Internal function to display a possibly missing cell"""
+    return value if isinstance(value, str) else ""
+
+
+def _filename(row: int, name) -> str:
+    """Internal function to build a unique, filesystem-safe file name"""
+    slug = _re.sub(r"[^A-Za-z0-9]+", "_", _text(name)).strip("_").lower()
+    return f"{row + 1:04d}_{slug or 'unnamed'}"
+
+
+def _render_text(name, email, lines, total) -> str:
+    """Internal function to render a plain text confirmation"""
+    rendered = []
+
+    for line in lines:
+        personalisation = ", ".join(
+            text
+            for text in [
+                f"back name '{line['Back Name']}'" if _text(line["Back Name"]) else "",
+                f"initials '{line['Initials']}'" if _text(line["Initials"]) else "",
+            ]
+            if text
+        )
+        rendered.append(
+            _TEXT_LINE.substitute(
+                product=line["Product"],
+                size=_text(line["Size"]),
+                personalisation=f" ({personalisation})" if personalisation else "",
+                price=f"{line['Price']:.2f}",
+            )
+        )
+
+    return _TEXT_TEMPLATE.substitute(
+        name=_text(name),
+        email=_text(email),
+        lines="\n".join(rendered) + "\n" if rendered else "No items ordered\n",
+        total=f"{total:.2f}",
+    )
+
+
+def _render_html(name, email, lines, total) -> str:
+    """Internal function to render an HTML confirmation"""
+    rendered = [
+        _HTML_LINE.substitute(
+            product=_html.escape(line["Product"]),
+            size=_html.escape(_text(line["Size"])),
+            back_name=_html.escape(_text(line["Back Name"])),
+            initials=_html.escape(_text(line["Initials"])),
+            price=f"{line['Price']:.2f}",
+        )
+        for line in lines
+    ]
+
+    return _HTML_TEMPLATE.substitute(
+        name=_html.escape(_text(name)),
+        email=_html.escape(_text(email)),
+        lines="\n".join(rendered),
+        total=f"{total:.2f}",
+    )
+
+
+def _render_csv(name, email, lines, total) -> str:
+    """Internal function to render a CSV confirmation"""
+    buffer = _io.StringIO()
+    writer = _csv.writer(buffer, lineterminator="\n")
+
+    writer.writerow(_CSV_COLUMNS)
+    for line in lines:
+        writer.writerow(
+            [
+                line["Product"],
+                _text(line["Size"]),
+                _text(line["Back Name"]),
+                _text(line["Initials"]),
+                f"{line['Price']:.2f}",
+            ]
+        )
+    writer.writerow(["Total", "", "", "", f"{total:.2f}"])
+
+    return buffer.getvalue()
+
+
+_RENDERERS = {
+    "txt": _render_text,
+    "html": _render_html,
+    "csv": _render_csv,
+}
+
+
+def generate_confirmations(
+    df_orders: _pd.DataFrame,
+    output_dir: str = "confirmations",
+    fmt: str = "txt",
+    max_workers: int = 8,
+) -> _pd.DataFrame:
+    """
+    Write an order confirmation for every respondent, plus a combined
+    summary.csv, to output_dir
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+    output_dir : str, optional
+        Directory to write the confirmations to
+    fmt : str, optional
+        File format of the confirmations, one of txt, html or csv
+    max_workers : int, optional
+        Number of threads used to write the files
+
+    Returns
+    -------
+    df_summary: pd.DataFrame
+        One row per respondent with their name, email, number of items,
+        total price and the file their confirmation was written to
+    """
+    if fmt not in _RENDERERS:
+        raise ValueError(f"Format {fmt} not supported, select from {list(_RENDERERS)}")
+
+    render = _RENDERERS[fmt]
+
+    # Resolve products and prices for every order in one pass
+    df_lines = _extract_order_lines(df_orders)
+    df_lines["Price"] = df_lines["Product"].map(_PRICING).fillna(0.0)
+    df_summary = _price_orders(df_orders, df_lines)
+
+    # Bucket the lines by response in a single pass over the records
+    lines_by_row = {}
+    for line in df_lines.to_dict("records"):
+        lines_by_row.setdefault(line["Row"], []).append(line)
+
+    df_summary["File"] = [
+        _os.path.join(output_dir, f"{_filename(row, name)}.{fmt}")
+        for row, name in zip(df_summary["Row"], df_summary["Name"], strict=True)
+    ]
+
+    _os.makedirs(output_dir, exist_ok=True)
+
+    def _write(record):
+        contents = render(
+            record["Name"],
+            record["Email"],
+            lines_by_row.get(record["Row"], []),
+            record["Total Price (£)"],
+        )
+        with open(record["File"], "w", encoding="utf-8") as f:
+            f.write(contents)
+
+    with _ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the results so that any exception is raised here
+        list(executor.map(_write, df_summary.to_dict("records")))
+
+    df_summary.to_csv(_os.path.join(output_dir, "summary.csv"), index=False)
+
+    return df_summary
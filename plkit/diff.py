@@ -0,0 +1,155 @@
+"""
+Functions for comparing two exports of the order responses, e.g. the export
+used for the supplier order and a later one, to find the orders which were
+added, changed or withdrawn in between
+"""
+
+import numpy as _np
+import pandas as _pd
+
+from ._catalogue import ORDER_COLUMNS as _ORDER_COLUMNS
+from .generate_order_form import _tabulate_products
+from .read_orders import extract_order_lines as _extract_order_lines
+from .read_orders import extract_orders as _extract_orders
+from .read_orders import price_orders as _price_orders
+
+
+def _respondents(df_orders: _pd.DataFrame) -> tuple:
+    """Internal function to key every response by its normalised email
+    (or name, if the email is missing) and how many earlier responses
+    share that key, along with its price and a hash of its contents"""
+
+    for column_name in _ORDER_COLUMNS:
+        if column_name not in df_orders.columns:
+            raise LookupError(f"Column {column_name} not found in input DataFrame")
+
+    df_lines = _extract_order_lines(df_orders)
+    df_respondents = _price_orders(df_orders, df_lines)
+
+    emails = df_respondents["Email"].str.strip().str.casefold()
+    names = df_respondents["Name"].str.strip().str.casefold()
+    keys = emails.where(emails.notna() & (emails != ""), names).fillna("")
+
+    df_respondents["Key"] = keys
+    df_respondents["Occurrence"] = keys.groupby(keys).cumcount()
+    df_respondents["Hash"] = _pd.util.hash_pandas_object(
+        df_orders[_ORDER_COLUMNS].astype(object), index=False
+    ).to_numpy()
+
+    return df_respondents, df_lines
+
+
+def _counted(df_orders: _pd.DataFrame) -> _np.ndarray:
+    """Internal function to find how many times generate_product_order()
+    counts the items of every response. read_order() resolves a repeated
+    name to its first response, so that response is counted once for each
+    response with its name and the others are not counted at all."""
+    names = df_orders["Name"].reset_index(drop=True)
+    groups = names.groupby(names, dropna=False, sort=False)
+
+    return _np.where(
+        groups.cumcount().to_numpy() == 0, groups.transform("size").to_numpy(), 0
+    )
+
+
+def diff_exports(old, new) -> tuple:
+    """
+    Compare two exports of the order responses
+
+    Respondents are matched by email (or name, where the email is
+    missing); a respondent who submitted several responses is matched
+    response by response in submission order.
+
+    The delta follows generate_product_order(), in which a repeated name
+    counts the items of its first response. A response added under the
+    name of an earlier respondent therefore adds another copy of that
+    respondent's items, not its own.
+
+    Parameters
+    ----------
+    old : str or pd.DataFrame
+        The earlier export, as a file name or a DataFrame from
+        extract_orders()
+    new : str or pd.DataFrame
+        The later export, as a file name or a DataFrame from
+        extract_orders()
+
+    Returns
+    -------
+    df_changes: pd.DataFrame
+        One row per added, changed or removed response, with its status,
+        name, email, position in each export and change in price
+    df_delta: pd.DataFrame
+        The signed change in every product and sizing count, laid out
+        like the table from generate_product_order()
+    """
+    df_old_orders = _extract_orders(old) if isinstance(old, str) else old
+    df_new_orders = _extract_orders(new) if isinstance(new, str) else new
+
+    df_old, df_old_lines = _respondents(df_old_orders)
+    df_new, df_new_lines = _respondents(df_new_orders)
+
+    # Hash join of the two snapshots
+    df_joined = df_old.merge(
+        df_new,
+        on=["Key", "Occurrence"],
+        how="outer",
+        suffixes=(" Old", " New"),
+        indicator=True,
+    )
+    # Report in the order of the old export, followed by new responses
+    df_joined = df_joined.sort_values(["Row Old", "Row New"], ignore_index=True)
+
+    status = _np.select(
+        [
+            (df_joined["_merge"] == "right_only").to_numpy(),
+            (df_joined["_merge"] == "left_only").to_numpy(),
+            (df_joined["Hash Old"] != df_joined["Hash New"]).to_numpy(),
+        ],
+        ["added", "removed", "changed"],
+        default="unchanged",
+    )
+    df_joined = df_joined[status != "unchanged"]
+
+    df_changes = _pd.DataFrame(
+        {
+            "Status": status[status != "unchanged"],
+            "Name": df_joined["Name New"].fillna(df_joined["Name Old"]).to_numpy(),
+            "Email": df_joined["Email New"].fillna(df_joined["Email Old"]).to_numpy(),
+            "Old Row": df_joined["Row Old"].astype("Int64").array,
+            "New Row": df_joined["Row New"].astype("Int64").array,
+            "Price Change (£)": (
+                df_joined["Total Price (£) New"].fillna(0.0)
+                - df_joined["Total Price (£) Old"].fillna(0.0)
+            )
+            .round(2)
+            .to_numpy(),
+        }
+    )
+
+    # Responses which did not change cancel out, unless a change to another
+    # response with the same name moves which response is counted
+    old_counted = _counted(df_old_orders)[df_old_lines["Row"].to_numpy()]
+    new_counted = _counted(df_new_orders)[df_new_lines["Row"].to_numpy()]
+
+    df_delta = _tabulate_products(
+        _pd.concat(
+            [
+                df_new_lines.assign(Quantity=new_counted),
+                df_old_lines.assign(Quantity=-old_counted),
+            ],
+            ignore_index=True,
+        )
+    )
+
+    # Add total pricing row
+    total_row = dict.fromkeys(df_delta.columns, _np.nan)
+    total_row["Total Quantity"] = int(df_delta["Total Quantity"].sum())
+    total_row["Unit Price (£)"] = "Total"
+    total_row["Total Price (£)"] = round(df_delta["Total Price (£)"].sum(), 2)
+    df_delta = _pd.concat(
+        [df_delta.astype(object), _pd.DataFrame([total_row], dtype=object)],
+        ignore_index=True,
+    )
+
+    return df_changes, df_delta
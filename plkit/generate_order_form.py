@@ -5,6 +5,10 @@ packaged as a DataFrame extracted using plkit.extract_orders()
 
 import numpy as _np
 import pandas as _pd
+from ._catalogue import PRICING as _PRICING
+from ._catalogue import SIZES as _SIZES
+from ._catalogue import WOMENS_SIZING as _WOMENS_SIZING
+from .read_orders import orders_between as _orders_between
 from .read_orders import read_order
 
 class Product:
@@ -25,38 +29,7 @@ class Product:
         """
 
         # Internal dictionary to store the pricing of individual items
-        self.pricing = {
-            "Unisex EcoLayer Hoodie": 38.40,  # pounds
-            "Unisex EcoLayer Hoodie - 1 Personalisation": 42.60,
-            "Unisex EcoLayer Hoodie - 2 Personalisations": 46.80,
-            "Unisex Shield Performance Sweatshirt": 36.0,
-            "Unisex Shield Performance Sweatshirt - 1 Personalisation": 40.20,
-            "Unisex Shield Performance Sweatshirt - 2 Personalisations": 44.40,
-            "Men's EcoLayer Tee (Navy)": 18.60,
-            "Men's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
-            "Men's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
-            "Men's EcoLayer Tee (Forest)": 18.60,
-            "Men's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
-            "Men's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
-            "Women's EcoLayer Tee (Navy)": 18.60,
-            "Women's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
-            "Women's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
-            "Women's EcoLayer Tee (Forest)": 18.60,
-            "Women's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
-            "Women's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
-            "Men's Sublimated Tee (Navy)": 25.62,
-            "Men's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
-            "Men's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
-            "Men's Sublimated Tee (Forest)": 25.62,
-            "Men's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
-            "Men's Sublimated Tee - 2 Personalisations (Forest)": 25.62,
-            "Women's Sublimated Tee (Navy)": 25.62,
-            "Women's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
-            "Women's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
-            "Women's Sublimated Tee (Forest)": 25.62,
-            "Women's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
-            "Women's Sublimated Tee - 2 Personalisations (Forest)": 25.62
-        }
+        self.pricing = dict(_PRICING)
 
         if name not in self.pricing:
             raise LookupError(f"Item {name} not found.")
@@ -78,6 +51,10 @@ class Product:
         self.unit_price = self.pricing[name]
         self.total_price = 0
 
+        # Positions in df_orders of the responses counted for each sizing,
+        # only recorded if set to a dict of lists before updating
+        self.contributions = None
+
     def __str__(self) -> str:
         return self.__class__.__name__
 
@@ -133,23 +110,82 @@ class Product:
                 if isinstance(sizing, str) and sizing.strip() in self.sizings:
                     self.update_count(sizing.strip())
 
+                    if self.contributions is not None:
+                        self.contributions[sizing.strip()].append(order.row)
+
+
+class Provenance:
+    """Class to map the cells of an order sheet back to the responses they
+    were counted from, stored in compressed sparse row (CSR) form"""
+
+    def __init__(
+        self, indptr: _np.ndarray, indices: _np.ndarray, spans: dict, labels
+    ) -> None:
+        """
+        Initialise the provenance index
+
+        Parameters
+        ----------
+        indptr : np.ndarray
+            Start of the contributions of every cell in indices, followed by
+            the total number of contributions
+        indices : np.ndarray
+            Positions in df_orders of the contributing responses, cell by cell
+        spans : dict or None
+            The first and last + 1 cell covered by each (row, column) of the
+            order sheet, with a column of None covering the whole row. If
+            None, every row of the sheet is a single cell.
+        labels : pd.Index
+            The index of df_orders
+
+        Returns
+        -------
+        None
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.spans = spans
+        self.labels = labels
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
+
+    def rows(self, row: int, column=None):
+        """
+        Find the responses which contributed to a cell of the order sheet
+
+        Parameters
+        ----------
+        row : int
+            Position of the row in the order sheet
+        column : optional
+            Label of the column, e.g. "XL", 12 or "Total Quantity"
+
+        Returns
+        -------
+        labels : pd.Index
+            Index labels in df_orders of the contributing responses, repeated
+            for a response which contributed several items, so that
+            df_orders.loc[labels] lists every contribution
+        """
+        if self.spans is None:
+            n_cells = len(self.indptr) - 1
+            span = (row, row + 1) if 0 <= row < n_cells else None
+        else:
+            span = self.spans.get((row, column), self.spans.get((row, None)))
+
+        if span is None:
+            raise LookupError(f"No provenance recorded for row {row}, column {column}")
+
+        start, end = self.indptr[span[0]], self.indptr[span[1]]
+
+        return self.labels[self.indices[start:end]]
+
 
 def _update_df_products(df_products, product) -> _pd.DataFrame:
     """Internal function to add a new row to df_products with the
     information in an updated instance of the Product class"""
 
-    womens_sizing = {
-        "XS": 6,
-        "S": 8,
-        "M": 10,
-        "L": 12,
-        "XL": 14,
-        "2XL": 16,
-        "3XL": 18,
-        "4XL": 20,
-        "5XL": 22,
-    }
-
     product_name = product.name.replace("(Forest)", "").replace("(Navy)", "").strip()
 
     new_row = {
@@ -160,14 +196,100 @@ def _update_df_products(df_products, product) -> _pd.DataFrame:
         "Total Price (£)": product.total_price,
     }
 
-    for sizing in ["XS", "S", "M", "L", "XL", "2XL", "3XL", "4XL", "5XL"]:
-        size_key = womens_sizing[sizing] if "Women's" in product_name else sizing
+    for sizing in _SIZES:
+        size_key = _WOMENS_SIZING[sizing] if "Women's" in product_name else sizing
         new_row[size_key] = product.sizings.get(sizing, 0)
 
     return _pd.concat([df_products, _pd.DataFrame([new_row])], ignore_index=True)
 
 
-def generate_product_order(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+def _tabulate_products(df_lines: _pd.DataFrame) -> _pd.DataFrame:
+    """Internal function to count order lines by product and sizing, laid
+    out like the product rows of generate_product_order(). Lines may carry
+    a (possibly negative) 'Quantity' column, otherwise each counts once."""
+
+    valid = df_lines["Product"].isin(list(_PRICING)) & df_lines["Size"].isin(_SIZES)
+    df_valid = df_lines[valid]
+
+    if "Quantity" in df_valid:
+        quantity = df_valid["Quantity"]
+    else:
+        quantity = _pd.Series(1, index=df_valid.index)
+    counts = (
+        quantity.groupby([df_valid["Product"], df_valid["Size"]])
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(index=list(_PRICING), columns=_SIZES, fill_value=0)
+        .astype(int)
+    )
+
+    rows = []
+    for product, sizings in counts.iterrows():
+        product_name = product.replace("(Forest)", "").replace("(Navy)", "").strip()
+        total_quantity = int(sizings.sum())
+
+        row = {
+            "Product Name": product_name,
+            "Colour": "Forest" if "Forest" in product else "Navy",
+            "Total Quantity": total_quantity,
+            "Unit Price (£)": _PRICING[product],
+            "Total Price (£)": _PRICING[product] * total_quantity,
+        }
+
+        for sizing in _SIZES:
+            size_key = _WOMENS_SIZING[sizing] if "Women's" in product_name else sizing
+            row[size_key] = int(sizings[sizing])
+
+        rows.append(row)
+
+    columns = (
+        ["Product Name", "Colour", "Total Quantity"]
+        + _SIZES
+        + list(_WOMENS_SIZING.values())
+        + ["Unit Price (£)", "Total Price (£)"]
+    )
+
+    return _pd.DataFrame(rows, columns=columns)
+
+
+def _product_provenance(df_products, contributions, labels) -> Provenance:
+    """Internal function to index the contributions of every product and
+    sizing, in the order of the rows and sizing columns of df_products"""
+
+    n_sizes = len(_SIZES)
+    n_products = len(contributions) // n_sizes
+
+    indptr = _np.zeros(len(contributions) + 1, dtype=_np.int64)
+    indptr[1:] = _np.cumsum([len(rows) for rows in contributions])
+    indices = _np.fromiter(
+        (row for rows in contributions for row in rows),
+        dtype=_np.int64,
+        count=int(indptr[-1]),
+    )
+
+    spans = {}
+    for i, name in enumerate(df_products["Product Name"].iloc[:n_products]):
+        first = i * n_sizes
+        # The whole row is the responses counted in its total quantity
+        spans[(i, None)] = spans[(i, "Total Quantity")] = (first, first + n_sizes)
+
+        for n, sizing in enumerate(_SIZES):
+            column = _WOMENS_SIZING[sizing] if "Women's" in name else sizing
+            other = sizing if "Women's" in name else _WOMENS_SIZING[sizing]
+            spans[(i, column)] = (first + n, first + n + 1)
+            # The sizing columns of the other fit are always empty
+            spans[(i, other)] = (first, first)
+
+    # The total row covers every product
+    total = (0, len(contributions))
+    spans[(n_products, None)] = spans[(n_products, "Total Quantity")] = total
+
+    return Provenance(indptr, indices, spans, labels)
+
+
+def generate_product_order(
+    df_orders: _pd.DataFrame, start=None, end=None, provenance: bool = False
+) -> _pd.DataFrame:
     """
     Generate a DataFrame of product-specific order information,
     given a DataFrame of orders
@@ -176,82 +298,51 @@ def generate_product_order(df_orders: _pd.DataFrame) -> _pd.DataFrame:
     ----------
     df_orders: _pd.DataFrame
         The order details converted to a pandas DataFrame
+    start : str or datetime, optional
+        Only include the orders completed at or after start
+    end : str or datetime, optional
+        Only include the orders completed before end
+    provenance : bool, optional
+        Also return which responses were counted in every sizing and total
+        quantity cell
 
     Returns
     -------
     df_products: _pd.DataFrame
         Full order details for every product,
         completed with the orders contained in df_orders
+    provenance : Provenance
+        Only returned if provenance is True. The responses behind every
+        cell of df_products, valid for df_products as returned.
     """
 
+    if start is not None or end is not None:
+        df_orders = _orders_between(df_orders, start, end)
+
     # List of all products - women's sizing is different
-    items = [
-        "Unisex EcoLayer Hoodie",
-        "Unisex EcoLayer Hoodie - 1 Personalisation",
-        "Unisex EcoLayer Hoodie - 2 Personalisations",
-        "Unisex Shield Performance Sweatshirt",
-        "Unisex Shield Performance Sweatshirt - 1 Personalisation",
-        "Unisex Shield Performance Sweatshirt - 2 Personalisations",
-        "Men's EcoLayer Tee (Navy)",
-        "Men's EcoLayer Tee - 1 Personalisation (Navy)",
-        "Men's EcoLayer Tee - 2 Personalisations (Navy)",
-        "Men's EcoLayer Tee (Forest)",
-        "Men's EcoLayer Tee - 1 Personalisation (Forest)",
-        "Men's EcoLayer Tee - 2 Personalisations (Forest)",
-        "Women's EcoLayer Tee (Navy)",
-        "Women's EcoLayer Tee - 1 Personalisation (Navy)",
-        "Women's EcoLayer Tee - 2 Personalisations (Navy)",
-        "Women's EcoLayer Tee (Forest)",
-        "Women's EcoLayer Tee - 1 Personalisation (Forest)",
-        "Women's EcoLayer Tee - 2 Personalisations (Forest)",
-        "Men's Sublimated Tee (Navy)",
-        "Men's Sublimated Tee - 1 Personalisation (Navy)",
-        "Men's Sublimated Tee - 2 Personalisations (Navy)",
-        "Men's Sublimated Tee (Forest)",
-        "Men's Sublimated Tee - 1 Personalisation (Forest)",
-        "Men's Sublimated Tee - 2 Personalisations (Forest)",
-        "Women's Sublimated Tee (Navy)",
-        "Women's Sublimated Tee - 1 Personalisation (Navy)",
-        "Women's Sublimated Tee - 2 Personalisations (Navy)",
-        "Women's Sublimated Tee (Forest)",
-        "Women's Sublimated Tee - 1 Personalisation (Forest)",
-        "Women's Sublimated Tee - 2 Personalisations (Forest)"
-    ]
+    items = list(_PRICING)
 
     # Names of all people who submitted an order
     names = df_orders["Name"].to_list()
 
     # Empty df to store product order info
-    columns = [
-        "Product Name",
-        "Colour",
-        "Total Quantity",
-        "XS",
-        "S",
-        "M",
-        "L",
-        "XL",
-        "2XL",
-        "3XL",
-        "4XL",
-        "5XL",
-        6,
-        8,
-        10,
-        12,
-        14,
-        16,
-        18,
-        20,
-        22,
-        "Unit Price (£)",
-        "Total Price (£)",
-    ]
+    columns = (
+        ["Product Name", "Colour", "Total Quantity"]
+        + _SIZES
+        + list(_WOMENS_SIZING.values())
+        + ["Unit Price (£)", "Total Price (£)"]
+    )
     df_products = _pd.DataFrame(columns=columns)
 
+    # Contributing responses, one list per product and sizing
+    contributions = []
+
     for item in items:
         product = Product(item)  # Initialise empty class
 
+        if provenance:
+            product.contributions = {sizing: [] for sizing in product.sizings}
+
         for name in names:  # Populate product with the info from all orders
             order = read_order(df_orders, name)
             order.identify_products()
@@ -259,6 +350,9 @@ def generate_product_order(df_orders: _pd.DataFrame) -> _pd.DataFrame:
 
         df_products = _update_df_products(df_products, product)
 
+        if provenance:
+            contributions.extend(product.contributions.values())
+
     # Add total pricing row
     count_all_items = _np.sum(df_products["Total Quantity"].to_numpy())
     total_price = _np.sum(df_products["Total Price (£)"].to_numpy())
@@ -275,10 +369,17 @@ def generate_product_order(df_orders: _pd.DataFrame) -> _pd.DataFrame:
     df_products.iloc[-1, 1] = "Club Name"
     df_products.iloc[-1, 2] = "Badminton"
 
+    if provenance:
+        return df_products, _product_provenance(
+            df_products, contributions, df_orders.index
+        )
+
     return df_products
 
 
-def generate_product_personalisations(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+def generate_product_personalisations(
+    df_orders: _pd.DataFrame, start=None, end=None, provenance: bool = False
+) -> _pd.DataFrame:
     """
     Generate a DataFrame of product-specific order personalisations,
     given a DataFrame of orders
@@ -287,25 +388,25 @@ def generate_product_personalisations(df_orders: _pd.DataFrame) -> _pd.DataFrame
     ----------
     df_orders: _pd.DataFrame
         The order details converted to a pandas DataFrame
+    start : str or datetime, optional
+        Only include the orders completed at or after start
+    end : str or datetime, optional
+        Only include the orders completed before end
+    provenance : bool, optional
+        Also return which response every row was taken from
 
     Returns
     -------
     df_personal: _pd.DataFrame
         Full personalisation details for every product,
         completed with the orders contained in df_orders
+    provenance : Provenance
+        Only returned if provenance is True. The response behind every row
+        of df_personal, valid for df_personal as returned.
     """
 
-    womens_sizing = {
-        "XS": 6,
-        "S": 8,
-        "M": 10,
-        "L": 12,
-        "XL": 14,
-        "2XL": 16,
-        "3XL": 18,
-        "4XL": 20,
-        "5XL": 22,
-    }
+    if start is not None or end is not None:
+        df_orders = _orders_between(df_orders, start, end)
 
     # Names of all people who submitted an order
     names = df_orders["Name"].to_list()
@@ -321,6 +422,9 @@ def generate_product_personalisations(df_orders: _pd.DataFrame) -> _pd.DataFrame
 
     df_personal = _pd.DataFrame(columns=columns)
 
+    # Position in df_orders of the response behind every row
+    contributions = []
+
     for name in names:  # Populate product with the info from all orders
         order = read_order(df_orders, name)
         order.identify_products()
@@ -334,7 +438,7 @@ def generate_product_personalisations(df_orders: _pd.DataFrame) -> _pd.DataFrame
 
                 new_row = {
                     "Product Name": product_name,
-                    "Size": womens_sizing.get(sizing, sizing)
+                    "Size": _WOMENS_SIZING.get(sizing, sizing)
                     if "Women's" in product_name
                     else sizing,
                     "Colour": "Forest" if "Forest" in product_name else "Navy",
@@ -349,5 +453,117 @@ def generate_product_personalisations(df_orders: _pd.DataFrame) -> _pd.DataFrame
                     df_personal = _pd.concat(
                         [df_personal, _pd.DataFrame([new_row])], ignore_index=True
                     )
+                    contributions.append(order.row)
+
+    if provenance:
+        # Every row comes from a single response
+        n_rows = len(contributions)
+        return df_personal, Provenance(
+            _np.arange(n_rows + 1),
+            _np.array(contributions, dtype=_np.int64),
+            None,
+            df_orders.index,
+        )
 
     return df_personal
+
+
+def _codes(column: _pd.Series, order: dict = None) -> _np.ndarray:
+    """Internal function to convert a column to integer sort codes, in the
+    given order if specified and otherwise sorted by value"""
+
+    if order is not None:
+        codes = column.map(lambda value: order.get(value, -1))
+        codes = _np.array(codes, dtype=_np.int64)
+
+        # Values missing from the order sort after it, each with its own
+        # code, and missing values sort last
+        unknown = codes == -1
+        values = column[unknown].astype(object).map(str).where(column[unknown].notna())
+        unknown_codes, uniques = _pd.factorize(values, sort=True)
+        unknown_codes[unknown_codes == -1] = len(uniques)
+        codes[unknown] = len(order) + unknown_codes
+
+        return codes
+
+    # Missing values (-1) sort before any text
+    values = column.astype(object).map(str).where(column.notna())
+    codes, _ = _pd.factorize(values, sort=True)
+
+    return codes.astype(_np.int64)
+
+
+def generate_print_runs(df_personal: _pd.DataFrame) -> tuple:
+    """
+    Group the personalised garments into print runs for the print shop,
+    sorted by product, colour, size and personalisation text, with
+    identical personalisations collapsed into a single row
+
+    Parameters
+    ----------
+    df_personal: pd.DataFrame
+        Full personalisation details for every product, as returned by
+        generate_product_personalisations()
+
+    Returns
+    -------
+    df_runs: pd.DataFrame
+        One row per distinct personalisation within each print run, with
+        the number of garments needing it
+    df_summary: pd.DataFrame
+        One row per print run, i.e. product, colour and size, with the
+        number of garments and distinct personalisations in the run
+    """
+
+    key_columns = [
+        "Product Name",
+        "Colour",
+        "Size",
+        "Initials (sleeve personalisation)",
+        "Name (back personalisation)",
+    ]
+
+    for column_name in key_columns:
+        if column_name not in df_personal.columns:
+            raise LookupError(f"Column {column_name} not found in input DataFrame")
+
+    # Garment sizes are ordered XS -> 5XL rather than alphabetically
+    size_order = {size: n for n, size in enumerate(_SIZES)}
+    size_order.update({size: n for n, size in enumerate(_WOMENS_SIZING.values())})
+
+    codes = _np.vstack(
+        [
+            _codes(df_personal["Product Name"]),
+            _codes(df_personal["Colour"]),
+            _codes(df_personal["Size"], size_order),
+            _codes(df_personal["Initials (sleeve personalisation)"]),
+            _codes(df_personal["Name (back personalisation)"]),
+        ]
+    )
+
+    # np.lexsort is stable and sorts by the last key first
+    order = _np.lexsort(codes[::-1])
+    codes = codes[:, order]
+    df_sorted = df_personal[key_columns].iloc[order].reset_index(drop=True)
+
+    # Run-length encode identical rows, and identical (product, colour, size)
+    n_rows = len(df_sorted)
+    changed = _np.diff(codes, axis=1) != 0
+    first = _np.ones(min(n_rows, 1), dtype=bool)
+    row_starts = _np.flatnonzero(_np.r_[first, changed.any(axis=0)])
+    run_starts = _np.flatnonzero(_np.r_[first, changed[:3].any(axis=0)])
+
+    run_ids = _np.searchsorted(run_starts, row_starts, side="right")
+
+    df_runs = df_sorted.iloc[row_starts].reset_index(drop=True)
+    df_runs.insert(0, "Run", run_ids)
+    df_runs["Quantity"] = _np.diff(_np.r_[row_starts, n_rows])
+
+    df_summary = df_sorted.iloc[run_starts, :3].reset_index(drop=True)
+    df_summary.insert(0, "Run", _np.arange(1, len(run_starts) + 1))
+    df_summary["Garments"] = _np.diff(_np.r_[run_starts, n_rows])
+    df_summary["Distinct Personalisations"] = _np.bincount(
+        run_ids, minlength=len(run_starts) + 1
+    )[1:]
+
+    return df_runs, df_summary
@@ -0,0 +1,211 @@
+"""
+An on-disk history of the order lines of every campaign, stored as a parquet
+dataset partitioned by campaign and year so that queries spanning several
+campaigns only read the columns and partitions they need.
+
+Requires pyarrow, available with ``pip install plkit[arrow]``.
+"""
+
+import datetime as _datetime
+import logging as _logging
+import os as _os
+from typing import List as _List
+
+import pandas as _pd
+
+from .read_orders import extract_order_lines as _extract_order_lines
+from .read_orders import extract_orders as _extract_orders
+
+_logger = _logging.getLogger(__name__)
+
+_PARTITION_COLUMNS = ["Campaign", "Year"]
+
+
+def _pyarrow():
+    """Internal function to import pyarrow, with a helpful error if it is
+    not installed"""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "The order history requires pyarrow, install it with "
+            "'pip install plkit[arrow]'"
+        ) from e
+
+    return pyarrow
+
+
+def _schema(pa):
+    """Internal function returning the schema of the history dataset,
+    fixed so that every partition is readable together even when a
+    column is entirely empty in one campaign"""
+    return pa.schema(
+        [
+            ("Row", pa.int64()),
+            ("Slot", pa.int64()),
+            ("Name", pa.string()),
+            ("Email", pa.string()),
+            ("Item", pa.string()),
+            ("Size", pa.string()),
+            ("Back Name", pa.string()),
+            ("Initials", pa.string()),
+            ("Personalisations", pa.int64()),
+            ("Product", pa.string()),
+            ("Campaign", pa.string()),
+            ("Year", pa.int32()),
+        ]
+    )
+
+
+def _as_string(value):
+    """Internal function to convert a cell to a string, keeping missing
+    cells missing"""
+    if value is None or isinstance(value, str) or _pd.isna(value):
+        return value
+    return str(value)
+
+
+def _partitioning(pa):
+    """Internal function returning the hive partitioning of the dataset,
+    e.g. Campaign=2024 Kit/Year=2024/part-0.parquet"""
+    schema = _schema(pa)
+
+    return pa.dataset.partitioning(
+        pa.schema([schema.field(name) for name in _PARTITION_COLUMNS]),
+        flavor="hive",
+    )
+
+
+def _delete_campaign(pa, root: str, campaign: str) -> None:
+    """Internal function to delete the lines of a campaign archived under
+    any year, along with the partition directories left empty"""
+    if not _os.path.isdir(root):
+        return
+
+    dataset = pa.dataset.dataset(
+        root, schema=_schema(pa), format="parquet", partitioning=_partitioning(pa)
+    )
+
+    for fragment in dataset.get_fragments(
+        filter=pa.dataset.field("Campaign") == campaign
+    ):
+        _os.remove(fragment.path)
+
+        directory = _os.path.dirname(fragment.path)
+        while directory != _os.path.normpath(root) and not _os.listdir(directory):
+            _os.rmdir(directory)
+            directory = _os.path.dirname(directory)
+
+
+def archive_orders(orders, root: str, campaign: str, year: int = None) -> int:
+    """
+    Write the cleaned order lines of a campaign to the history dataset.
+    Archiving a campaign again replaces its previous lines, even if they
+    were archived under another year.
+
+    Parameters
+    ----------
+    orders : str or pd.DataFrame
+        The responses of the campaign, as a file name or a DataFrame from
+        extract_orders()
+    root : str
+        Directory holding the history dataset
+    campaign : str
+        Name of the campaign, e.g. '2024 Kit Order'
+    year : int, optional
+        Year of the campaign, by default the current year
+
+    Returns
+    -------
+    n_lines : int
+        The number of order lines archived
+    """
+    pa = _pyarrow()
+
+    if not isinstance(campaign, str) or not campaign.strip():
+        raise ValueError("Campaign must be a non-empty string")
+
+    if year is None:
+        year = _datetime.date.today().year
+
+    df_orders = _extract_orders(orders) if isinstance(orders, str) else orders
+    df_lines = _extract_order_lines(df_orders)
+
+    df_lines["Campaign"] = campaign.strip()
+    df_lines["Year"] = int(year)
+
+    schema = _schema(pa)
+    df_lines = df_lines[schema.names].astype(object)
+
+    # Excel reads cells such as initials '12' or size '8' as numbers
+    for field in schema:
+        if field.type == pa.string():
+            df_lines[field.name] = df_lines[field.name].map(_as_string)
+
+    table = pa.Table.from_pandas(df_lines, schema=schema, preserve_index=False)
+
+    _delete_campaign(pa, root, campaign.strip())
+
+    pa.dataset.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=_partitioning(pa),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+    _logger.info(
+        "Archived %d order lines of %s (%d) to %s", len(table), campaign, year, root
+    )
+
+    return len(table)
+
+
+def query_history(
+    root: str, columns: _List[str] = None, filters=None
+) -> _pd.DataFrame:
+    """
+    Read order lines from the history dataset, e.g.
+
+    query_history(root, ["Year", "Product", "Size"], [("Year", ">=", 2022)])
+
+    Only the requested columns are read, partitions excluded by the filters
+    on Campaign or Year are skipped entirely, and filters on other columns
+    are applied while scanning using the parquet statistics.
+
+    Parameters
+    ----------
+    root : str
+        Directory holding the history dataset
+    columns : list, optional
+        Columns to read, by default all of them
+    filters : list or pyarrow.compute.Expression, optional
+        Rows to keep, either as a pyarrow expression or as (column, op,
+        value) tuples in the format of pandas.read_parquet(). A list of
+        tuples is combined with AND, a list of lists of tuples with OR.
+
+    Returns
+    -------
+    df_history: pd.DataFrame
+        The matching order lines
+    """
+    pa = _pyarrow()
+    schema = _schema(pa)
+
+    if columns is not None:
+        for column_name in columns:
+            if column_name not in schema.names:
+                raise LookupError(f"Column {column_name} not found in order history")
+
+    if isinstance(filters, (list, tuple)):
+        filters = pa.parquet.filters_to_expression(filters) if filters else None
+
+    dataset = pa.dataset.dataset(
+        root, schema=schema, format="parquet", partitioning=_partitioning(pa)
+    )
+    table = dataset.to_table(columns=columns, filter=filters)
+
+    return table.to_pandas()
@@ -0,0 +1,262 @@
+"""
+A lightweight, pandas-free implementation of the order processing for CSV
+exports of the Microsoft form. Produces the same product and personalisation
+tables as plkit.generate_product_order() and
+plkit.generate_product_personalisations(), using only the standard library so
+that short runs do not pay the cost of importing pandas and numpy.
+"""
+
+import csv as _csv
+import os as _os
+from typing import Dict as _Dict
+from typing import List as _List
+
+from ._catalogue import BACK_NAME_COLUMNS as _BACK_NAME_COLUMNS
+from ._catalogue import ITEM_COLUMNS as _ITEM_COLUMNS
+from ._catalogue import PRICING as _PRICING
+from ._catalogue import SIZES as _SIZES
+from ._catalogue import SIZING_COLUMNS as _SIZING_COLUMNS
+from ._catalogue import SLEEVE_NAME_COLUMNS as _SLEEVE_NAME_COLUMNS
+from ._catalogue import WOMENS_SIZING as _WOMENS_SIZING
+from ._catalogue import clean_string as _clean_string
+from ._catalogue import product_name as _product_name
+
+PRODUCT_COLUMNS = (
+    ["Product Name", "Colour", "Total Quantity"]
+    + _SIZES
+    + list(_WOMENS_SIZING.values())
+    + ["Unit Price (£)", "Total Price (£)"]
+)
+
+PERSONALISATION_COLUMNS = [
+    "Product Name",
+    "Size",
+    "Colour",
+    "Initials (sleeve personalisation)",
+    "Name (back personalisation)",
+]
+
+
+def extract_orders(filename: str = "responses.csv") -> _List[dict]:
+    """
+    Read in a CSV export of the order response form.
+
+    Parameters
+    ----------
+    filename : str, optional
+        The name of the CSV responses form saved from Microsoft forms
+
+    Returns
+    -------
+    orders : list
+        One dictionary per response, keyed by column name. Empty cells
+        are stored as None and all other cells are cleaned strings.
+    """
+
+    if not filename.endswith(".csv"):
+        raise ValueError("Input must be a CSV File")
+
+    if not _os.path.isfile(filename):
+        raise FileNotFoundError(f"File {filename} does not exist")
+
+    with open(filename, newline="", encoding="utf-8-sig") as f:
+        reader = _csv.DictReader(f)
+
+        if reader.fieldnames is None:
+            raise ValueError(f"The file {filename} is empty")
+
+        for column_name in ["Name", "Email"] + _ITEM_COLUMNS + _SIZING_COLUMNS:
+            if column_name not in reader.fieldnames:
+                raise LookupError(f"Column {column_name} not found in {filename}")
+
+        return [
+            {
+                key: _clean_string(value) if value != "" else None
+                for key, value in row.items()
+            }
+            for row in reader
+        ]
+
+
+def _read_order(row: dict) -> _List[tuple]:
+    """Internal function to convert a single response into a list of
+    (product, sizing, back name, initials) tuples, mirroring plkit.Order"""
+
+    slots = []
+
+    for n in range(len(_ITEM_COLUMNS)):
+        item = row.get(_ITEM_COLUMNS[n])
+        sizing = row.get(_SIZING_COLUMNS[n])
+        back_name = row.get(_BACK_NAME_COLUMNS[n])
+        sleeve_name = row.get(_SLEEVE_NAME_COLUMNS[n])
+
+        # Strip string entries
+        sizing = sizing.strip().upper() if isinstance(sizing, str) else sizing
+        back_name = back_name.strip() if isinstance(back_name, str) else back_name
+        if isinstance(sleeve_name, str):
+            sleeve_name = sleeve_name.strip()
+
+        product = None
+        if isinstance(item, str):
+            n_personal = isinstance(back_name, str) + isinstance(sleeve_name, str)
+            product = _product_name(item.strip(), n_personal)
+
+        slots.append((product, sizing, back_name, sleeve_name))
+
+    return slots
+
+
+def _resolve_orders(orders: _List[dict]) -> _List[_List[tuple]]:
+    """Internal function to look up the order for every respondent in the
+    same way as plkit.read_order(), i.e. by the first row with their name"""
+
+    first_order = {}
+
+    for row in orders:
+        name = row.get("Name")
+
+        if not isinstance(name, str):
+            raise ValueError(f"Non-string name {name} detected!")
+
+        if name not in first_order:
+            first_order[name] = _read_order(row)
+
+    return [first_order[row["Name"]] for row in orders]
+
+
+def generate_product_order(orders: _List[dict]) -> _List[dict]:
+    """
+    Generate the product-specific order information, given a list of
+    orders read with plkit.lite.extract_orders()
+
+    Parameters
+    ----------
+    orders : list
+        The order details as read by plkit.lite.extract_orders()
+
+    Returns
+    -------
+    products : list
+        One dictionary per row of the product order table, keyed by the
+        entries of PRODUCT_COLUMNS
+    """
+
+    counts: _Dict[tuple, int] = {}
+
+    for slots in _resolve_orders(orders):
+        for product, sizing, _, _ in slots:
+            if isinstance(product, str) and sizing in _SIZES:
+                counts[(product, sizing)] = counts.get((product, sizing), 0) + 1
+
+    products = []
+
+    for item, unit_price in _PRICING.items():
+        product_name = item.replace("(Forest)", "").replace("(Navy)", "").strip()
+        total_quantity = 0
+
+        row = {
+            "Product Name": product_name,
+            "Colour": "Forest" if "Forest" in item else "Navy",
+        }
+
+        for sizing in _SIZES:
+            count = counts.get((item, sizing), 0)
+            total_quantity += count
+
+            size_key = _WOMENS_SIZING[sizing] if "Women's" in product_name else sizing
+            row[size_key] = count
+
+        row["Total Quantity"] = total_quantity
+        row["Unit Price (£)"] = unit_price
+        row["Total Price (£)"] = unit_price * total_quantity if total_quantity else 0
+
+        products.append(row)
+
+    # Add total pricing row
+    count_all_items = products[0]["Total Quantity"]
+    total_price = products[0]["Total Price (£)"]
+    for row in products[1:]:
+        count_all_items += row["Total Quantity"]
+        total_price += row["Total Price (£)"]
+
+    # The total row is stored as floats in the pandas DataFrame
+    products.append(
+        {
+            "Total Quantity": float(count_all_items),
+            "Unit Price (£)": "Total",
+            "Total Price (£)": float(total_price),
+        }
+    )
+
+    # Add label for club name
+    products.append({"Colour": "Club Name", "Total Quantity": "Badminton"})
+
+    return products
+
+
+def generate_product_personalisations(orders: _List[dict]) -> _List[dict]:
+    """
+    Generate the product-specific order personalisations, given a list of
+    orders read with plkit.lite.extract_orders()
+
+    Parameters
+    ----------
+    orders : list
+        The order details as read by plkit.lite.extract_orders()
+
+    Returns
+    -------
+    personalisations : list
+        One dictionary per personalised item, keyed by the entries of
+        PERSONALISATION_COLUMNS
+    """
+
+    personalisations = []
+
+    for slots in _resolve_orders(orders):
+        for product, sizing, back_name, sleeve_name in slots:
+            # Only add row for personalised item
+            if isinstance(product, str) and (
+                isinstance(sleeve_name, str) or isinstance(back_name, str)
+            ):
+                personalisations.append(
+                    {
+                        "Product Name": product,
+                        "Size": _WOMENS_SIZING.get(sizing, sizing)
+                        if "Women's" in product
+                        else sizing,
+                        "Colour": "Forest" if "Forest" in product else "Navy",
+                        "Initials (sleeve personalisation)": sleeve_name,
+                        "Name (back personalisation)": back_name,
+                    }
+                )
+
+    return personalisations
+
+
+def write_csv(rows: _List[dict], filename: str, columns: _List[str]) -> None:
+    """
+    Write a table produced by plkit.lite to a CSV file, with missing cells
+    left empty.
+
+    Parameters
+    ----------
+    rows : list
+        The rows of the table as dictionaries
+    filename : str
+        Name of the CSV file to write
+    columns : list
+        Column names, in order, e.g. PRODUCT_COLUMNS
+
+    Returns
+    -------
+    None
+    """
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = _csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+
+        for row in rows:
+            writer.writerow(
+                ["" if row.get(column) is None else row[column] for column in columns]
+            )
@@ -0,0 +1,274 @@
+"""
+Functions for matching a bank or payment platform export against the total
+price of every respondent's order
+"""
+
+import os as _os
+import re as _re
+
+import numpy as _np
+import pandas as _pd
+
+from ._parsing import parse_amounts as _parse_amounts
+from .read_orders import price_orders as _price_orders
+from .search import _normalise
+from .search import get_search_index as _get_search_index
+
+# Default payment export headings, override with the columns argument. Only
+# the amount is required, the others are used for matching where present.
+PAYMENT_COLUMNS = {
+    "Amount": "Amount",
+    "Email": "Email",
+    "Name": "Name",
+    "Reference": "Reference",
+}
+
+_EMAIL = _re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+# A reference which is only a response ID, e.g. '4', '#4' or 'Order 4'.
+# Numbers within longer references, e.g. 'Kit order 2025', are not IDs.
+_ID_REFERENCE = _re.compile(r"(?:order|id)?\s*#?\s*(\d+)", _re.IGNORECASE)
+
+# Honorifics added to payer names by banks, e.g. 'MR J SMITH'
+_TITLES = {"mr", "mrs", "ms", "miss", "mx", "dr"}
+
+# How much closer the best respondent must be than any other respondent
+# for a payer name to be matched to it
+_MARGIN = 0.1
+
+_RESPONDENT_COLUMNS = [
+    "Name",
+    "Email",
+    "Responses",
+    "Items",
+    "Total Price (£)",
+    "Paid (£)",
+    "Balance (£)",
+    "Payments",
+    "Matched By",
+]
+
+
+def _read_payments(payments) -> _pd.DataFrame:
+    """Internal function to read the payment export from a CSV or Excel
+    file"""
+    if not isinstance(payments, str):
+        return payments.copy()
+
+    if not _os.path.isfile(payments):
+        raise FileNotFoundError(f"File {payments} does not exist")
+
+    if payments.endswith(".csv"):
+        return _pd.read_csv(payments, encoding="utf-8-sig")
+    if payments.endswith(".xlsx"):
+        return _pd.read_excel(payments)
+
+    raise ValueError("Payments must be a CSV or Excel file")
+
+
+def _email_key(s) -> str:
+    """Internal function to normalise an email address"""
+    return s.strip().casefold() if isinstance(s, str) else ""
+
+
+def _payer_name(s) -> str:
+    """Internal function to normalise a name and drop any honorific"""
+    return " ".join(word for word in _normalise(s).split() if word not in _TITLES)
+
+
+def _name_key(s) -> str:
+    """Internal function to normalise a name, ignoring word order so that
+    e.g. 'SMITH JOHN' matches 'John Smith'"""
+    return " ".join(sorted(_payer_name(s).split()))
+
+
+def _unique_lookup(keys, values) -> dict:
+    """Internal function to build a hash table from keys to values,
+    leaving out empty keys and keys shared by different values"""
+    lookup = {}
+
+    for key, value in zip(keys, values, strict=True):
+        if key:
+            lookup[key] = value if lookup.get(key, value) == value else None
+
+    return {key: value for key, value in lookup.items() if value is not None}
+
+
+def _respondents(df_orders: _pd.DataFrame) -> tuple:
+    """Internal function to total the responses of every respondent, keyed
+    by email or, where the email is missing, by name"""
+
+    df_prices = _price_orders(df_orders)
+
+    emails = df_prices["Email"].map(_email_key)
+    names = df_prices["Name"].map(_name_key)
+    keys = emails.where(emails != "", "name:" + names)
+
+    df_respondents = (
+        df_prices.assign(Key=keys)
+        .groupby("Key", sort=False)
+        .agg(
+            **{
+                "Name": ("Name", "first"),
+                "Email": ("Email", "first"),
+                "Responses": ("Row", "size"),
+                "Items": ("Items", "sum"),
+                "Total Price (£)": ("Total Price (£)", "sum"),
+            }
+        )
+        .round({"Total Price (£)": 2})
+    )
+
+    return df_respondents, keys.to_numpy(dtype=object), names.to_numpy(dtype=object)
+
+
+def match_payments(
+    df_orders: _pd.DataFrame, payments, columns: dict = None, min_score: float = 0.6
+) -> dict:
+    """
+    Match the payments in a bank or payment platform export against the
+    total price of every respondent's order
+
+    Payments are matched, in turn, by the payer's email, by an email,
+    response ID (e.g. '4' or 'Order #4', but not 'Kit order 2025') or name
+    given as the payment reference, by the payer's
+    name and finally by the closest payer name, using a hash table for
+    every step. Responses sharing an email are totalled together, and a
+    respondent may pay in several payments. Only incoming (positive)
+    payments are considered.
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+    payments : str or pd.DataFrame
+        The payment export, as a CSV or Excel file name or a DataFrame
+    columns : dict, optional
+        Payment export headings for any of the keys of PAYMENT_COLUMNS
+        which differ from the defaults
+    min_score : float, optional
+        Minimum similarity, between 0 and 1, for a payer name to be
+        matched to the closest respondent name. The closest respondent
+        must also be clearly closer than any other respondent.
+
+    Returns
+    -------
+    matches : dict
+        DataFrames of the respondents who have paid in full ("paid"),
+        paid too little ("underpaid"), paid too much ("overpaid") or not
+        paid at all ("unpaid"), and of the payments which could not be
+        matched to any respondent ("unmatched")
+    """
+    headings = dict(PAYMENT_COLUMNS, **(columns or {}))
+    df_payments = _read_payments(payments)
+
+    if headings["Amount"] not in df_payments.columns:
+        raise LookupError(f"Column {headings['Amount']} not found in payments")
+
+    def _column(key):
+        if headings[key] in df_payments.columns:
+            return df_payments[headings[key]].to_numpy(dtype=object)
+        return _np.full(len(df_payments), _np.nan, dtype=object)
+
+    amounts = _parse_amounts(df_payments[headings["Amount"]]).to_numpy(dtype=float)
+    incoming = _np.flatnonzero(amounts > 0)
+
+    df_respondents, row_keys, row_names = _respondents(df_orders)
+
+    # Hash tables from each normalised identifier to the respondent
+    by_email = {key: key for key in df_respondents.index if not key.startswith("name:")}
+    by_name = _unique_lookup(row_names, row_keys)
+    by_id = {}
+    if "ID" in df_orders.columns:
+        by_id = _unique_lookup(df_orders["ID"].map(str).to_numpy(), row_keys)
+
+    def _by_reference(reference):
+        if not isinstance(reference, str):
+            return None
+        for email in _EMAIL.findall(reference):
+            if _email_key(email) in by_email:
+                return by_email[_email_key(email)]
+        id_reference = _ID_REFERENCE.fullmatch(reference.strip())
+        if id_reference is not None and id_reference.group(1) in by_id:
+            return by_id[id_reference.group(1)]
+        return by_name.get(_name_key(reference))
+
+    search_index = None
+
+    def _by_closest_name(name):
+        nonlocal search_index
+        name = _payer_name(name)
+        if not name:
+            return None
+        if search_index is None:
+            search_index = _get_search_index(df_orders)
+
+        df_matches = search_index.search(name, limit=5, min_score=0.0)
+        if len(df_matches) == 0 or df_matches["Score"].iloc[0] < min_score:
+            return None
+
+        # Ambiguous if another respondent is almost as close
+        keys = row_keys[df_orders.index.get_indexer(df_matches["Row"])]
+        scores = df_matches["Score"].to_numpy()
+        others = scores[keys != keys[0]]
+        if len(others) and scores[0] - others[0] < _MARGIN:
+            return None
+
+        return keys[0]
+
+    strategies = [
+        ("email", _column("Email"), lambda email: by_email.get(_email_key(email))),
+        ("reference", _column("Reference"), _by_reference),
+        ("name", _column("Name"), lambda name: by_name.get(_name_key(name))),
+        ("closest name", _column("Name"), _by_closest_name),
+    ]
+
+    found = _np.zeros(len(df_payments), dtype=bool)
+    matched_key = _np.full(len(df_payments), None, dtype=object)
+    matched_by = _np.full(len(df_payments), None, dtype=object)
+
+    for strategy, values, lookup in strategies:
+        for i in incoming[~found[incoming]]:
+            key = lookup(values[i])
+            if key is not None:
+                found[i] = True
+                matched_key[i] = key
+                matched_by[i] = strategy
+
+    matched = incoming[found[incoming]]
+    df_matched = _pd.DataFrame(
+        {
+            "Key": matched_key[matched],
+            "Amount": amounts[matched],
+            "Matched By": matched_by[matched],
+        }
+    )
+    df_paid = df_matched.groupby("Key", sort=False).agg(
+        **{
+            "Paid (£)": ("Amount", "sum"),
+            "Payments": ("Amount", "size"),
+            "Matched By": ("Matched By", lambda by: ", ".join(dict.fromkeys(by))),
+        }
+    )
+
+    df_respondents = df_respondents.join(df_paid)
+    df_respondents["Paid (£)"] = df_respondents["Paid (£)"].fillna(0.0).round(2)
+    df_respondents["Payments"] = df_respondents["Payments"].fillna(0).astype(int)
+    df_respondents["Matched By"] = df_respondents["Matched By"].fillna("")
+    df_respondents["Balance (£)"] = (
+        df_respondents["Paid (£)"] - df_respondents["Total Price (£)"]
+    ).round(2)
+    df_respondents = df_respondents[_RESPONDENT_COLUMNS].reset_index(drop=True)
+
+    balance = df_respondents["Balance (£)"]
+    unpaid = (df_respondents["Payments"] == 0) & (balance < 0)
+
+    return {
+        "paid": df_respondents[balance == 0].reset_index(drop=True),
+        "underpaid": df_respondents[(balance < 0) & ~unpaid].reset_index(drop=True),
+        "overpaid": df_respondents[balance > 0].reset_index(drop=True),
+        "unpaid": df_respondents[unpaid].reset_index(drop=True),
+        "unmatched": df_payments.iloc[incoming[~found[incoming]]].reset_index(
+            drop=True
+        ),
+    }
@@ -0,0 +1,319 @@
+"""
+The order processing expressed as a small DAG of memoized stages, so that
+repeated runs only recompute the stages whose inputs have changed, and a
+watch mode which reruns the pipeline whenever the responses file changes.
+"""
+
+import hashlib as _hashlib
+import logging as _logging
+import os as _os
+import time as _time
+from typing import Callable as _Callable
+from typing import Dict as _Dict
+from typing import List as _List
+
+import pandas as _pd
+
+from .generate_order_form import generate_product_order
+from .generate_order_form import generate_product_personalisations
+from .read_orders import _clean_orders
+from .read_orders import _parse_timestamps
+from .read_orders import _read_responses
+from .read_orders import extract_order_lines
+from .validate import count_processed_back_personalisations
+from .validate import count_processed_order
+from .validate import count_processed_sleeve_personalisations
+from .validate import validate_orders
+
+_logger = _logging.getLogger(__name__)
+
+
+def _content_hash(value) -> str:
+    """Internal function to hash the contents of a stage input or output"""
+    digest = _hashlib.sha256()
+
+    if isinstance(value, _pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(repr(list(value.dtypes.astype(str))).encode())
+        digest.update(
+            _pd.util.hash_pandas_object(value.astype(object), index=True)
+            .to_numpy()
+            .tobytes()
+        )
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(repr(key).encode())
+            digest.update(_content_hash(value[key]).encode())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            digest.update(_content_hash(item).encode())
+    else:
+        digest.update(repr(value).encode())
+
+    return digest.hexdigest()
+
+
+def _file_hash(filename: str) -> str:
+    """Internal function to hash the contents of a file"""
+    digest = _hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class Stage:
+    """Class to hold a single step of the order processing pipeline"""
+
+    def __init__(self, name: str, func: _Callable, inputs: _List[str]) -> None:
+        """
+        Initialise a pipeline stage
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage, used to refer to its output
+        func : callable
+            Function computing the stage output, called with the values
+            of inputs as positional arguments
+        inputs : list
+            Names of the stages or run parameters the stage depends on
+
+        Returns
+        -------
+        None
+        """
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
+
+
+def _validate(df_orders, df_lines, df_products, df_personal) -> dict:
+    """Internal function to run the input rules and count checks"""
+
+    checks = [
+        ("Items", len(df_lines), count_processed_order(df_products)),
+        (
+            "Back name personalisations",
+            int(df_lines["Back Name"].map(lambda name: isinstance(name, str)).sum()),
+            count_processed_back_personalisations(df_personal),
+        ),
+        (
+            "Sleeve personalisations",
+            int(df_lines["Initials"].map(lambda name: isinstance(name, str)).sum()),
+            count_processed_sleeve_personalisations(df_personal),
+        ),
+    ]
+
+    df_counts = _pd.DataFrame(checks, columns=["Check", "Expected", "Found"])
+    df_counts["Passed"] = df_counts["Expected"] == df_counts["Found"]
+
+    return {"violations": validate_orders(df_orders), "counts": df_counts}
+
+
+def _export(df_products, df_personal, validation, output_dir, fmt) -> _List[str]:
+    """Internal function to write the order sheets and validation report"""
+
+    _os.makedirs(output_dir, exist_ok=True)
+
+    filenames = []
+    for df, name in [
+        (df_products, "products"),
+        (df_personal, "personalisations"),
+        (validation["violations"], "violations"),
+        (validation["counts"], "counts"),
+    ]:
+        filename = _os.path.join(output_dir, f"{name}.{fmt}")
+
+        if fmt == "csv":
+            df.to_csv(filename, index=False)
+        elif fmt == "xlsx":
+            df.to_excel(filename, index=False)
+        else:
+            raise ValueError(f"Unknown output format {fmt}")
+
+        filenames.append(filename)
+
+    return filenames
+
+
+def default_stages() -> _List[Stage]:
+    """
+    The stages of the standard order processing pipeline:
+    extract -> clean -> order_lines / products / personalisations
+    -> validate -> export
+
+    Returns
+    -------
+    stages : list
+        The stages in a valid execution order
+    """
+    return [
+        Stage("extract", _read_responses, ["filename"]),
+        Stage(
+            "clean",
+            lambda df: _parse_timestamps(_clean_orders(df.copy())),
+            ["extract"],
+        ),
+        Stage("order_lines", extract_order_lines, ["clean"]),
+        Stage("products", generate_product_order, ["clean"]),
+        Stage("personalisations", generate_product_personalisations, ["clean"]),
+        Stage(
+            "validate",
+            _validate,
+            ["clean", "order_lines", "products", "personalisations"],
+        ),
+        Stage(
+            "export",
+            _export,
+            ["products", "personalisations", "validate", "output_dir", "format"],
+        ),
+    ]
+
+
+class Pipeline:
+    """Class to run a DAG of stages, caching each stage output by the
+    content hash of its inputs"""
+
+    def __init__(self, stages: _List[Stage] = None) -> None:
+        """
+        Initialise the pipeline
+
+        Parameters
+        ----------
+        stages : list, optional
+            Stages in a valid execution order, see default_stages()
+
+        Returns
+        -------
+        None
+        """
+        self.stages = default_stages() if stages is None else stages
+        self.recomputed: _List[str] = []
+
+        # Stage name -> (input hash, output, output hash)
+        self._cache: _Dict[str, tuple] = {}
+
+        names = set()
+        for stage in self.stages:
+            if stage.name in names:
+                raise ValueError(f"Duplicate stage {stage.name}")
+            names.add(stage.name)
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
+
+    def run(self, **params) -> dict:
+        """
+        Run the pipeline, recomputing only the stages whose inputs changed.
+        The names of the recomputed stages are stored in self.recomputed.
+
+        Parameters
+        ----------
+        **params
+            Run parameters referred to by the stage inputs. For the
+            default stages these are filename, output_dir and format.
+
+        Returns
+        -------
+        outputs : dict
+            The output of every stage, keyed by stage name
+        """
+        outputs = {}
+        hashes = {}
+
+        for name, value in params.items():
+            outputs[name] = value
+            # The source file is identified by its contents, not its name
+            hashes[name] = (
+                _file_hash(value) if name == "filename" else _content_hash(value)
+            )
+
+        self.recomputed = []
+
+        for stage in self.stages:
+            for name in stage.inputs:
+                if name not in outputs:
+                    raise LookupError(
+                        f"Input {name} of stage {stage.name} has not been computed"
+                    )
+
+            key = _content_hash([hashes[name] for name in stage.inputs])
+            cached = self._cache.get(stage.name)
+
+            if cached is None or cached[0] != key:
+                start = _time.perf_counter()
+                output = stage.func(*[outputs[name] for name in stage.inputs])
+                _logger.info(
+                    "Ran stage %s in %.3f s", stage.name, _time.perf_counter() - start
+                )
+
+                cached = (key, output, _content_hash(output))
+                self._cache[stage.name] = cached
+                self.recomputed.append(stage.name)
+
+            outputs[stage.name] = cached[1]
+            hashes[stage.name] = cached[2]
+
+        return outputs
+
+
+def watch(
+    filename: str,
+    output_dir: str = ".",
+    fmt: str = "csv",
+    interval: float = 2.0,
+    callback: _Callable = None,
+) -> None:
+    """
+    Poll the responses file and rerun the pipeline whenever it changes,
+    recomputing only the invalidated stages. Runs until interrupted.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the responses form saved from Microsoft forms
+    output_dir : str, optional
+        Directory to write the order sheets to
+    fmt : str, optional
+        File format of the order sheets, csv or xlsx
+    interval : float, optional
+        Time in seconds between checks of the responses file
+    callback : callable, optional
+        Called with the pipeline after every run
+
+    Returns
+    -------
+    None
+    """
+    pipeline = Pipeline()
+    last_mtime = None
+
+    while True:
+        try:
+            mtime = _os.stat(filename).st_mtime_ns
+        except OSError as e:
+            # The file may be briefly missing while it is saved, e.g. when
+            # it is deleted and the new version renamed into place
+            _logger.warning("Failed to read %s: %s", filename, e)
+            _time.sleep(interval)
+            continue
+
+        if mtime != last_mtime:
+            last_mtime = mtime
+
+            try:
+                pipeline.run(filename=filename, output_dir=output_dir, format=fmt)
+            except Exception as e:
+                # The file may have been caught part way through being saved
+                _logger.warning("Failed to process %s: %s", filename, e)
+            else:
+                if callback is not None:
+                    callback(pipeline)
+
+        _time.sleep(interval)
@@ -3,54 +3,61 @@ Functions and classes for reading in order information from the excel sheet
 containing responses from the Microsoft form
 """
 
+import logging as _logging
 import os as _os
 from typing import List as _List
 
 import numpy as _np
 import pandas as _pd
-import unicodedata as _unicodedata
-import re as _re
-
-def _clean_string(s):
-    """Internal function to clean and normalise a string imported from excel."""
-    if isinstance(s, str):
-        # Remove spacing characters
-        s = s.replace('\xa0', ' ')
-        # Remove other common invisible characters
-        s = _re.sub(r'[\u200B-\u200D\uFEFF\u00AD]', '', s)
-        # Normalize and strip whitespace
-        s = _unicodedata.normalize('NFKC', s).strip()
-    return s
-
-
-def extract_orders(filename: str = "responses.xlsx") -> _pd.DataFrame:
-    """
-    Read in the order response form as a pandas DataFrame.
 
-    Parameters
-    ----------
-    filename : str, optional
-        The name of the responses form saved from Microsoft forms
+from ._catalogue import BACK_NAME_COLUMNS as _BACK_NAME_COLUMNS
+from ._catalogue import ITEM_COLUMNS as _ITEM_COLUMNS
+from ._catalogue import PRICING as _PRICING
+from ._catalogue import SIZING_COLUMNS as _SIZING_COLUMNS
+from ._catalogue import SLEEVE_NAME_COLUMNS as _SLEEVE_NAME_COLUMNS
+from ._catalogue import clean_string as _clean_string
+from ._catalogue import product_name as _product_name
+from .search import search_orders as _search_orders
 
-    Returns
-    -------
-    df_orders : pd.DataFrame
-        The order details converted to a pandas DataFrame
-    """
+_logger = _logging.getLogger(__name__)
+
+# Submission timestamps recorded by Microsoft Forms
+_TIMESTAMP_COLUMNS = ["Start time", "Completion time"]
 
-    if not filename.endswith(".xlsx"):
-        raise ValueError("Input must be an Excel File")
+
+def _read_responses(filename: str) -> _pd.DataFrame:
+    """Internal function to read the raw responses form"""
+
+    if not filename.endswith((".xlsx", ".csv")):
+        raise ValueError("Input must be an Excel or CSV File")
 
     if not _os.path.isfile(filename):
         raise FileNotFoundError(f"File {filename} does not exist")
 
     try:
-        df_orders = _pd.read_excel(filename)
+        if filename.endswith(".csv"):
+            # Read every cell as text and only treat empty cells as missing,
+            # so that initials such as 'NA' survive
+            df_orders = _pd.read_csv(
+                filename,
+                dtype=str,
+                keep_default_na=False,
+                na_values=[""],
+                encoding="utf-8-sig",
+            )
+        else:
+            df_orders = _pd.read_excel(filename)
     except _pd.errors.EmptyDataError as e:
         raise _pd.errors.EmptyDataError(f"The file {filename} is empty") from e
     except Exception as e:
         raise Exception(f"An error occurred: {e}") from e
 
+    return df_orders
+
+
+def _clean_orders(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    """Internal function to clean hidden characters from the raw responses"""
+
     # Clean hidden characters
     df_orders['Name'] = df_orders['Name'].apply(_clean_string)
     df_orders['Email'] = df_orders['Email'].apply(_clean_string)
@@ -73,6 +80,184 @@ def extract_orders(filename: str = "responses.xlsx") -> _pd.DataFrame:
     return df_orders
 
 
+def extract_orders(
+    filename: str = "responses.xlsx", compact: bool = False
+) -> _pd.DataFrame:
+    """
+    Read in the order response form as a pandas DataFrame.
+
+    Parameters
+    ----------
+    filename : str, optional
+        The name of the responses form saved from Microsoft forms, either
+        as an Excel workbook or a CSV export
+    compact : bool, optional
+        Return the memory-lean representation produced by compact_orders()
+
+    Returns
+    -------
+    df_orders : pd.DataFrame
+        The order details converted to a pandas DataFrame
+    """
+
+    df_orders = _parse_timestamps(_clean_orders(_read_responses(filename)))
+
+    if compact:
+        df_orders = compact_orders(df_orders)
+
+    return df_orders
+
+
+def _parse_timestamps(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    """Internal function to convert the submission timestamps, which are
+    text in CSV exports, to datetimes"""
+
+    for column in _TIMESTAMP_COLUMNS:
+        if column in df_orders.columns and not _pd.api.types.is_datetime64_dtype(
+            df_orders[column]
+        ):
+            df_orders[column] = _pd.to_datetime(df_orders[column], errors="coerce")
+
+    return df_orders
+
+
+def orders_between(
+    df_orders: _pd.DataFrame, start=None, end=None, column: str = "Completion time"
+) -> _pd.DataFrame:
+    """
+    Select the responses submitted within a time window, e.g. those
+    received before the supplier cutoff
+
+    Exports list the responses in order of submission, so the window is
+    found by binary search and returned as a slice of df_orders. Responses
+    which are out of order are found with a stable sort instead. Responses
+    without a timestamp are never selected.
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+    start : str or datetime, optional
+        Select responses submitted at or after start
+    end : str or datetime, optional
+        Select responses submitted before end
+    column : str, optional
+        The timestamp column to use
+
+    Returns
+    -------
+    df_window: pd.DataFrame
+        The selected responses, in their original order and with their
+        original index
+    """
+
+    if column not in df_orders.columns:
+        raise LookupError(f"{column} column not found in input DataFrame")
+
+    times = df_orders[column]
+    if not _pd.api.types.is_datetime64_dtype(times):
+        times = _pd.to_datetime(times, errors="coerce")
+
+    start = None if start is None else _pd.Timestamp(start)
+    end = None if end is None else _pd.Timestamp(end)
+
+    if times.is_monotonic_increasing:
+        lo = 0 if start is None else int(times.searchsorted(start, side="left"))
+        hi = len(times) if end is None else int(times.searchsorted(end, side="left"))
+
+        return df_orders.iloc[lo : max(lo, hi)]
+
+    # Sort the positions of the timestamped responses by time
+    positions = _np.flatnonzero(times.notna().to_numpy())
+    positions = positions[
+        _np.argsort(times.iloc[positions].to_numpy(), kind="stable")
+    ]
+    sorted_times = times.iloc[positions]
+
+    lo = 0 if start is None else int(sorted_times.searchsorted(start, side="left"))
+    hi = (
+        len(positions)
+        if end is None
+        else int(sorted_times.searchsorted(end, side="left"))
+    )
+
+    return df_orders.iloc[_np.sort(positions[lo : max(lo, hi)])]
+
+
+def _string_dtype():
+    """Internal function returning the Arrow-backed string dtype, falling
+    back to the python-backed one if pyarrow is not installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return _pd.StringDtype("python")
+
+    return _pd.StringDtype("pyarrow")
+
+
+def _shared_categories(df_orders: _pd.DataFrame, columns: _List[str]):
+    """Internal function to build a single categorical dtype covering the
+    values of several columns"""
+    values = _pd.unique(
+        _np.concatenate([df_orders[column].dropna().to_numpy() for column in columns])
+    )
+
+    # Keep any non-string cells so that no information is lost
+    return _pd.CategoricalDtype(
+        sorted(values, key=lambda value: (not isinstance(value, str), str(value)))
+    )
+
+
+def compact_orders(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    """
+    Convert the order responses to a memory-lean representation.
+
+    The item and sizing columns are stored as categoricals, with the same
+    category set shared across all five item slots, and the free text
+    columns (name, email and personalisations) as Arrow-backed strings.
+    The memory usage before and after conversion is logged and stored in
+    ``df_orders.attrs["memory_usage"]``.
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+
+    Returns
+    -------
+    df_compact: pd.DataFrame
+        A copy of df_orders using categorical and string dtypes
+    """
+    memory_before = int(df_orders.memory_usage(deep=True).sum())
+
+    df_compact = df_orders.copy()
+
+    for columns in [_ITEM_COLUMNS, _SIZING_COLUMNS]:
+        columns = [column for column in columns if column in df_compact.columns]
+        dtype = _shared_categories(df_compact, columns)
+
+        for column in columns:
+            df_compact[column] = df_compact[column].astype(dtype)
+
+    string_dtype = _string_dtype()
+
+    for column in ["Name", "Email"] + _BACK_NAME_COLUMNS + _SLEEVE_NAME_COLUMNS:
+        if column in df_compact.columns:
+            df_compact[column] = df_compact[column].astype(string_dtype)
+
+    memory_after = int(df_compact.memory_usage(deep=True).sum())
+
+    df_compact.attrs["memory_usage"] = {
+        "before": memory_before,
+        "after": memory_after,
+    }
+    _logger.info(
+        "Compacted order responses from %d to %d bytes", memory_before, memory_after
+    )
+
+    return df_compact
+
+
 class Order:
     """Class to hold information about a single specific order"""
 
@@ -117,6 +302,7 @@ class Order:
             _np.nan
         ] * 5  # Product information is empty, extract with function identify_products()
         self.price = _np.nan # Price is initially empty, calculate from products
+        self.row = None  # Position of the response in df_orders, set by read_order()
 
         if not (len(items) == len(sizings) == len(back_names) == len(sleeve_names)):
             raise ValueError("Mismatch in items input!")
@@ -154,75 +340,15 @@ class Order:
             if isinstance(item, str):
                 # Extract how many personalisations an item has
                 n_personal = self.n_personalisations[n]
+                products[n] = _product_name(item, n_personal)
 
-                if n_personal == 0:
-                    products[n] = item
-
-                if n_personal == 1:
-                    products[n] = item + " - 1 Personalisation"
-
-                if n_personal == 2:
-                    products[n] = item + " - 2 Personalisations"
-
-        # Replace 'Green' with 'Forest'
-        products = [
-            product.replace("Green", "Forest") if isinstance(product, str) else product
-            for product in products
-        ]
-
-        # Move colour to the end of the product name
-        for i, product in enumerate(products):
-            if isinstance(product, str):
-                for colour in ["Forest", "Navy"]:
-                    if f"({colour})" in product:
-                        products[i] = (
-                            product.replace(f"({colour})", "").strip() + f" ({colour})"
-                        )
-
-        # Clean up double spacing in product name
-        self.products = [
-            product.replace("  ", " ").strip() if isinstance(product, str) else product
-            for product in products
-        ]
+        self.products = products
 
     def update_pricing(self) -> None:
         """
         Calculate the total price of a single person's
         order
         """
-        # unit pricing including VAT
-        pricing_info = {
-                    "Unisex EcoLayer Hoodie": 38.40,  # pounds
-                    "Unisex EcoLayer Hoodie - 1 Personalisation": 42.60,
-                    "Unisex EcoLayer Hoodie - 2 Personalisations": 46.80,
-                    "Unisex Shield Performance Sweatshirt": 36.0,
-                    "Unisex Shield Performance Sweatshirt - 1 Personalisation": 40.20,
-                    "Unisex Shield Performance Sweatshirt - 2 Personalisations": 44.40,
-                    "Men's EcoLayer Tee (Navy)": 18.60,
-                    "Men's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
-                    "Men's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
-                    "Men's EcoLayer Tee (Forest)": 18.60,
-                    "Men's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
-                    "Men's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
-                    "Women's EcoLayer Tee (Navy)": 18.60,
-                    "Women's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
-                    "Women's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
-                    "Women's EcoLayer Tee (Forest)": 18.60,
-                    "Women's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
-                    "Women's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
-                    "Men's Sublimated Tee (Navy)": 25.62,
-                    "Men's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
-                    "Men's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
-                    "Men's Sublimated Tee (Forest)": 25.62,
-                    "Men's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
-                    "Men's Sublimated Tee - 2 Personalisations (Forest)": 25.62,
-                    "Women's Sublimated Tee (Navy)": 25.62,
-                    "Women's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
-                    "Women's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
-                    "Women's Sublimated Tee (Forest)": 25.62,
-                    "Women's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
-                    "Women's Sublimated Tee - 2 Personalisations (Forest)": 25.62
-                }
 
         price = 0
 
@@ -230,12 +356,20 @@ class Order:
         self.identify_products()
 
         for product in self.products:
-            if product in pricing_info.keys():
-                price += pricing_info[product]
+            if product in _PRICING.keys():
+                price += _PRICING[product]
 
         self.price = price
 
 
+def _cell(df_orders: _pd.DataFrame, idx, column_name: str):
+    """Internal function to read the first cell of a column at idx, with
+    the pd.NA of string columns (e.g. from compact_orders()) read as the
+    NaN of object columns"""
+    value = df_orders.loc[idx, column_name].iloc[0]
+    return _np.nan if value is _pd.NA else value
+
+
 def _extract_items(df_orders: _pd.DataFrame, idx: int):
     """Internal function to extract the item information as a list"""
 
@@ -248,7 +382,7 @@ def _extract_items(df_orders: _pd.DataFrame, idx: int):
         if column_name not in df_orders.columns:
             raise LookupError(f"item column not found for {n_item} item")
 
-        items.append(df_orders.iloc[idx][column_name].iloc[0])
+        items.append(_cell(df_orders, idx, column_name))
 
     # Strip string entries
     items = [item.strip() if isinstance(item, str) else item for item in items]
@@ -271,7 +405,7 @@ def _extract_sizings(df_orders: _pd.DataFrame, idx: int):
         if column_name not in df_orders.columns:
             raise LookupError(f"Sizing column not found for {n_item} item")
 
-        sizings.append(df_orders.iloc[idx][column_name].iloc[0])
+        sizings.append(_cell(df_orders, idx, column_name))
 
     # Strip string entries
     sizings = [
@@ -296,7 +430,7 @@ def _extract_sleeve_names(df_orders: _pd.DataFrame, idx: int):
         if column_name not in df_orders.columns:
             raise LookupError(f"sleeve_name column not found for {n_item} item")
 
-        sleeve_names.append(df_orders.iloc[idx][column_name].iloc[0])
+        sleeve_names.append(_cell(df_orders, idx, column_name))
 
     # Strip string entries
     sleeve_names = [
@@ -318,7 +452,7 @@ def _extract_back_names(df_orders: _pd.DataFrame, idx: int):
         if column_name not in df_orders.columns:
             raise LookupError(f"back_name column not found for {n_item} item")
 
-        back_names.append(df_orders.iloc[idx][column_name].iloc[0])
+        back_names.append(_cell(df_orders, idx, column_name))
 
     # Strip string entries
     back_names = [
@@ -328,7 +462,35 @@ def _extract_back_names(df_orders: _pd.DataFrame, idx: int):
     return back_names
 
 
-def read_order(df_orders: _pd.DataFrame, name: str, email: str = None):
+def _closest_name(df_orders: _pd.DataFrame, name: str, email, fuzzy: bool) -> tuple:
+    """Internal function to resolve a name missing from df_orders to the
+    (name, email) of the closest respondent, or raise a LookupError listing
+    the candidates"""
+
+    df_matches = _search_orders(df_orders, name)
+
+    if fuzzy and len(df_matches) > 0:
+        # Prefer a candidate who also matches the given email
+        if isinstance(email, str):
+            same_email = df_matches["Email"].map(
+                lambda e: isinstance(e, str) and e.casefold() == email.casefold()
+            )
+            if same_email.any():
+                df_matches = df_matches[same_email]
+
+        return df_matches["Name"].iloc[0], df_matches["Email"].iloc[0]
+
+    message = f"Name {name} not found!"
+    if len(df_matches) > 0:
+        candidates = ", ".join(_pd.unique(df_matches["Name"]))
+        message += f" Did you mean: {candidates}?"
+
+    raise LookupError(message)
+
+
+def read_order(
+    df_orders: _pd.DataFrame, name: str, email: str = None, fuzzy: bool = False
+):
     """
     Obtain the order information for a specific person
 
@@ -340,6 +502,9 @@ def read_order(df_orders: _pd.DataFrame, name: str, email: str = None):
         The name of the person placing the order
     email : str, optional
         The email address of the person placing the order
+    fuzzy : bool, optional
+        If the name is not found exactly, use the closest matching name
+        from search_orders() instead of raising a LookupError
 
     Returns
     -------
@@ -358,24 +523,25 @@ def read_order(df_orders: _pd.DataFrame, name: str, email: str = None):
     if "Email" not in df_orders.columns:
         raise LookupError("Email column not found in input DataFrame")
 
-    # Extract email if not specified
     if isinstance(email, str):
         email = email.strip()
-    else:
-        email = df_orders.loc[df_orders["Name"] == name, "Email"].iloc[0]
 
     name_count = names.count(name)
 
     if name_count == 0:
-        raise LookupError(f"Name {name} not found!")
-    elif name_count == 1:
-        idx = df_orders[
-            df_orders["Name"] == name
-        ].index  # Only use email unless if are two identical names
+        name, email = _closest_name(df_orders, name, email, fuzzy)
+        name_count = names.count(name)
+
+    # Extract email if not specified
+    if not isinstance(email, str):
+        email = df_orders.loc[df_orders["Name"] == name, "Email"].iloc[0]
+
+    # Only use email unless if are two identical names
+    if name_count == 1:
+        mask = df_orders["Name"] == name
     else:
-        idx = df_orders[
-            (df_orders["Name"] == name) & (df_orders["Email"] == email)
-        ].index
+        mask = (df_orders["Name"] == name) & (df_orders["Email"] == email)
+    idx = df_orders[mask].index
 
     # Initialise class
     order_info = Order(
@@ -386,5 +552,164 @@ def read_order(df_orders: _pd.DataFrame, name: str, email: str = None):
         back_names=_extract_back_names(df_orders, idx),
         sleeve_names=_extract_sleeve_names(df_orders, idx),
     )
+    order_info.row = int(_np.flatnonzero(mask.to_numpy(dtype=bool, na_value=False))[0])
 
     return order_info
+
+
+def _string_mask(column: _pd.Series) -> _np.ndarray:
+    """Internal function to find the cells of a column holding strings"""
+
+    if isinstance(column.dtype, _pd.StringDtype):
+        return column.notna().to_numpy()
+
+    if isinstance(column.dtype, _pd.CategoricalDtype):
+        is_str = _np.array(
+            [isinstance(value, str) for value in column.cat.categories] + [False]
+        )
+        # Missing values have code -1, which picks the trailing False
+        return is_str[column.cat.codes.to_numpy()]
+
+    return _np.array(
+        [isinstance(value, str) for value in column.to_numpy(dtype=object)],
+        dtype=bool,
+    )
+
+
+def _take(df_orders: _pd.DataFrame, rows: _np.ndarray, column_name: str) -> list:
+    """Internal function to extract the cells of a column at the given rows"""
+    return list(df_orders[column_name].to_numpy(dtype=object)[rows])
+
+
+def _strip(values: list, upper: bool = False) -> list:
+    """Internal function to strip string entries of a list"""
+    return [
+        (value.strip().upper() if upper else value.strip())
+        if isinstance(value, str)
+        else value
+        for value in values
+    ]
+
+
+def extract_order_lines(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    """
+    Flatten the order responses into one row per ordered item, resolving
+    the product name of every item in a single pass.
+
+    Unlike read_order(), every response is used as-is, so two respondents
+    sharing a name each contribute their own items.
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+
+    Returns
+    -------
+    df_lines: pd.DataFrame
+        One row per item with the position of the response in df_orders
+        ("Row"), the item slot (1-5), the respondent's name and email, the
+        cleaned item, size and personalisations, the number of
+        personalisations and the resolved product name
+    """
+
+    for columns in [
+        ["Name", "Email"],
+        _ITEM_COLUMNS,
+        _SIZING_COLUMNS,
+        _BACK_NAME_COLUMNS,
+        _SLEEVE_NAME_COLUMNS,
+    ]:
+        for column_name in columns:
+            if column_name not in df_orders.columns:
+                raise LookupError(f"Column {column_name} not found in input DataFrame")
+
+    slots = []
+
+    for n in range(len(_ITEM_COLUMNS)):
+        has_item = _string_mask(df_orders[_ITEM_COLUMNS[n]])
+        rows = _np.flatnonzero(has_item)
+
+        items = _strip(_take(df_orders, rows, _ITEM_COLUMNS[n]))
+        sizings = _strip(_take(df_orders, rows, _SIZING_COLUMNS[n]), upper=True)
+        back_names = _strip(_take(df_orders, rows, _BACK_NAME_COLUMNS[n]))
+        sleeve_names = _strip(_take(df_orders, rows, _SLEEVE_NAME_COLUMNS[n]))
+
+        n_personalisations = [
+            isinstance(back_name, str) + isinstance(sleeve_name, str)
+            for back_name, sleeve_name in zip(back_names, sleeve_names, strict=True)
+        ]
+
+        slots.append(
+            _pd.DataFrame(
+                {
+                    "Row": rows,
+                    "Slot": n + 1,
+                    "Name": _take(df_orders, rows, "Name"),
+                    "Email": _take(df_orders, rows, "Email"),
+                    "Item": items,
+                    "Size": sizings,
+                    "Back Name": back_names,
+                    "Initials": sleeve_names,
+                    "Personalisations": _np.array(n_personalisations, dtype=int),
+                }
+            )
+        )
+
+    df_lines = _pd.concat(slots, ignore_index=True)
+    df_lines = df_lines.sort_values(["Row", "Slot"], kind="stable", ignore_index=True)
+
+    # Only a handful of distinct (item, personalisations) pairs exist
+    products = {
+        key: _product_name(*key)
+        for key in set(zip(df_lines["Item"], df_lines["Personalisations"], strict=True))
+    }
+    df_lines["Product"] = [
+        products[key]
+        for key in zip(df_lines["Item"], df_lines["Personalisations"], strict=True)
+    ]
+
+    return df_lines
+
+
+def price_orders(
+    df_orders: _pd.DataFrame, df_lines: _pd.DataFrame = None
+) -> _pd.DataFrame:
+    """
+    Calculate the total price of every respondent's order at once,
+    equivalent to calling Order.update_pricing() for each response
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+    df_lines: pd.DataFrame, optional
+        The order lines of df_orders, if already extracted with
+        extract_order_lines()
+
+    Returns
+    -------
+    df_prices: pd.DataFrame
+        One row per response, in the same order as df_orders, with the
+        name, email, number of items and total price rounded to the penny
+    """
+    if df_lines is None:
+        df_lines = extract_order_lines(df_orders)
+
+    # Products missing from the price list do not contribute to the total
+    unit_prices = df_lines["Product"].map(_PRICING).fillna(0.0)
+    rows = _np.arange(len(df_orders))
+
+    df_prices = _pd.DataFrame(
+        {
+            "Row": rows,
+            "Name": df_orders["Name"].to_numpy(dtype=object),
+            "Email": df_orders["Email"].to_numpy(dtype=object),
+            "Items": _np.bincount(df_lines["Row"], minlength=len(rows)),
+            "Total Price (£)": _np.bincount(
+                df_lines["Row"], weights=unit_prices, minlength=len(rows)
+            ).round(2),
+        }
+    )
+
+    return df_prices
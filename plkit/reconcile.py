@@ -0,0 +1,249 @@
+"""
+Functions for reconciling the supplier's invoice against the product order
+generated with plkit.generate_product_order()
+"""
+
+import os as _os
+
+import numpy as _np
+import pandas as _pd
+
+from ._catalogue import SIZES as _SIZES
+from ._catalogue import WOMENS_SIZING as _WOMENS_SIZING
+from ._catalogue import clean_string as _clean_string
+from ._catalogue import product_name as _product_name
+from ._parsing import parse_amounts as _parse_amounts
+
+# Default invoice headings, override with the columns argument
+INVOICE_COLUMNS = {
+    "Product": "Product",
+    "Colour": "Colour",
+    "Size": "Size",
+    "Quantity": "Quantity",
+    "Unit Price (£)": "Unit Price (£)",
+}
+
+_LETTER_SIZING = {str(size): letter for letter, size in _WOMENS_SIZING.items()}
+
+_KEY = ["Product Name", "Colour", "Size"]
+
+
+def _read_invoice(invoice) -> _pd.DataFrame:
+    """Internal function to read the invoice from an Excel or CSV file"""
+    if not isinstance(invoice, str):
+        return invoice.copy()
+
+    if not _os.path.isfile(invoice):
+        raise FileNotFoundError(f"File {invoice} does not exist")
+
+    if invoice.endswith(".xlsx"):
+        return _pd.read_excel(invoice)
+    if invoice.endswith(".csv"):
+        return _pd.read_csv(invoice, encoding="utf-8-sig")
+
+    raise ValueError("Invoice must be an Excel or CSV file")
+
+
+def _split_colour(product: str, colour=None) -> tuple:
+    """Internal function to split a normalised product name into the name
+    and colour used in the product order"""
+    name = product.replace("(Forest)", "").replace("(Navy)", "").strip()
+
+    if isinstance(colour, str) and colour.strip():
+        colour = _clean_string(colour).title().replace("Green", "Forest")
+    else:
+        colour = "Forest" if "Forest" in product else "Navy"
+
+    return name, colour
+
+
+def _letter_size(size) -> str:
+    """Internal function to convert an invoiced size to XS, S, ..., 5XL,
+    accepting the numeric women's sizes"""
+    if isinstance(size, float) and size.is_integer():
+        size = int(size)
+
+    size = _clean_string(str(size)).upper()
+
+    return _LETTER_SIZING.get(size, size)
+
+
+def _ordered_quantities(df_products: _pd.DataFrame) -> _pd.DataFrame:
+    """Internal function to flatten the product order into one row per
+    (product, colour, size), skipping the total and club name rows"""
+
+    for column_name in ["Product Name", "Colour", "Unit Price (£)"] + _SIZES:
+        if column_name not in df_products.columns:
+            raise LookupError(f"Column {column_name} not found in product order")
+
+    rows = []
+
+    for record in df_products.to_dict("records"):
+        name = record["Product Name"]
+        if not isinstance(name, str):
+            continue
+
+        for size in _SIZES:
+            column = _WOMENS_SIZING[size] if "Women's" in name else size
+            rows.append(
+                (name, record["Colour"], size, record[column], record["Unit Price (£)"])
+            )
+
+    return _pd.DataFrame(rows, columns=_KEY + ["Quantity", "Unit Price (£)"]).astype(
+        {"Quantity": int, "Unit Price (£)": float}
+    )
+
+
+def reconcile_invoice(
+    invoice, df_products: _pd.DataFrame, columns: dict = None
+) -> _pd.DataFrame:
+    """
+    Check every line of the supplier's invoice against the product order
+
+    Invoiced product names are normalised like Order.identify_products(),
+    so e.g. "Men's EcoLayer Tee (Green) - 1 Personalisation" matches the
+    Forest "Men's EcoLayer Tee - 1 Personalisation". Women's sizes may be
+    invoiced either as letters or as the numeric sizes. Lines repeating a
+    product, colour and size, e.g. from several campaigns, are summed.
+
+    Parameters
+    ----------
+    invoice : str or pd.DataFrame
+        The supplier invoice, as an Excel or CSV file name or a DataFrame
+    df_products : pd.DataFrame
+        The product order, as returned by generate_product_order()
+    columns : dict, optional
+        Invoice headings for any of the keys of INVOICE_COLUMNS which
+        differ from the defaults. The colour column is optional, otherwise
+        the colour is taken from the product name.
+
+    Returns
+    -------
+    df_reconciled: pd.DataFrame
+        One row per product, colour and size either ordered or invoiced,
+        with the ordered and invoiced quantities and unit prices, the
+        difference between the invoiced and expected price and a Status
+        of ok, quantity mismatch, price mismatch, quantity and price
+        mismatch, not ordered or not invoiced. Products with an invoice
+        line whose quantity or unit price is not a number, e.g. 'TBC', are
+        marked unreadable. Prices may include a currency symbol and commas.
+    """
+    headings = dict(INVOICE_COLUMNS, **(columns or {}))
+    df_invoice = _read_invoice(invoice)
+
+    for key, column_name in headings.items():
+        if key != "Colour" and column_name not in df_invoice.columns:
+            raise LookupError(f"Column {column_name} not found in invoice")
+
+    colours = (
+        df_invoice[headings["Colour"]]
+        if headings["Colour"] in df_invoice.columns
+        else _pd.Series(_np.nan, index=df_invoice.index)
+    )
+
+    # Normalise the invoice lines, resolving each distinct name only once
+    products = df_invoice[headings["Product"]].map(_clean_string)
+    invoiced = products.map(lambda product: isinstance(product, str))
+
+    keys = {}
+    split = []
+    for product, colour in zip(products[invoiced], colours[invoiced], strict=True):
+        colour = colour if isinstance(colour, str) else None
+
+        if (product, colour) not in keys:
+            keys[(product, colour)] = _split_colour(_product_name(product, 0), colour)
+        split.append(keys[(product, colour)])
+
+    quantity_cells = df_invoice.loc[invoiced, headings["Quantity"]]
+    price_cells = df_invoice.loc[invoiced, headings["Unit Price (£)"]]
+    quantity = _parse_amounts(quantity_cells)
+    unit_price = _parse_amounts(price_cells)
+
+    # Lines with a quantity or price which is not a number are not counted
+    unreadable = (quantity.isna() & quantity_cells.notna()) | (
+        unit_price.isna() & price_cells.notna()
+    )
+    quantity = quantity.mask(unreadable, 0)
+    unit_price = unit_price.mask(unreadable, 0.0)
+
+    df_lines = _pd.DataFrame(
+        {
+            "Product Name": [name for name, _ in split],
+            "Colour": [colour for _, colour in split],
+            "Size": df_invoice.loc[invoiced, headings["Size"]].map(_letter_size).array,
+            "Invoiced Quantity": quantity.fillna(0).astype(int).array,
+            "Invoiced Price (£)": (quantity * unit_price).fillna(0.0).array,
+            "Unreadable": unreadable.array,
+        }
+    )
+    df_lines = df_lines.groupby(_KEY, sort=False, as_index=False).sum()
+
+    df_ordered = _ordered_quantities(df_products)
+    df_ordered = df_ordered.rename(columns={"Quantity": "Ordered Quantity"})
+    df_ordered["Order"] = _np.arange(len(df_ordered))
+
+    # Hash join of the order against the invoice
+    df_reconciled = df_ordered.merge(df_lines, on=_KEY, how="outer", indicator=True)
+    df_reconciled = df_reconciled[
+        (df_reconciled["Ordered Quantity"].fillna(0) != 0)
+        | (df_reconciled["_merge"] != "left_only")
+    ]
+    # Product order first, then lines which were only invoiced
+    df_reconciled = df_reconciled.sort_values(
+        "Order", kind="stable", na_position="last", ignore_index=True
+    )
+
+    unreadable = df_reconciled["Unreadable"].fillna(0).to_numpy() > 0
+    ordered = df_reconciled["Ordered Quantity"].fillna(0).astype(int)
+    invoiced_quantity = df_reconciled["Invoiced Quantity"].fillna(0).astype(int)
+    invoiced_price = df_reconciled["Invoiced Price (£)"].fillna(0.0)
+    unit_price = df_reconciled["Unit Price (£)"]
+
+    invoiced_unit_price = invoiced_price / invoiced_quantity.replace(0, _np.nan)
+
+    quantity_mismatch = (ordered != invoiced_quantity).to_numpy()
+    price_mismatch = ((invoiced_unit_price - unit_price).abs() > 0.005).to_numpy()
+
+    status = _np.select(
+        [
+            unreadable,
+            (ordered == 0).to_numpy(),
+            (invoiced_quantity == 0).to_numpy(),
+            quantity_mismatch & price_mismatch,
+            quantity_mismatch,
+            price_mismatch,
+        ],
+        [
+            "unreadable",
+            "not ordered",
+            "not invoiced",
+            "quantity and price mismatch",
+            "quantity mismatch",
+            "price mismatch",
+        ],
+        default="ok",
+    )
+
+    sizes = [
+        _WOMENS_SIZING.get(size, size) if "Women's" in name else size
+        for name, size in zip(
+            df_reconciled["Product Name"], df_reconciled["Size"], strict=True
+        )
+    ]
+
+    return _pd.DataFrame(
+        {
+            "Product Name": df_reconciled["Product Name"].array,
+            "Colour": df_reconciled["Colour"].array,
+            "Size": _pd.array(sizes, dtype=object),
+            "Ordered Quantity": ordered.array,
+            "Invoiced Quantity": invoiced_quantity.array,
+            "Quantity Difference": (invoiced_quantity - ordered).array,
+            "Unit Price (£)": unit_price.array,
+            "Invoiced Unit Price (£)": invoiced_unit_price.round(2).array,
+            "Price Difference (£)": (invoiced_price - ordered * unit_price.fillna(0.0))
+            .round(2)
+            .array,
+            "Status": status,
+        }
+    )
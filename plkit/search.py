@@ -0,0 +1,248 @@
+"""
+Fuzzy lookup of respondents by name or email, using an index of character
+trigrams built once per DataFrame of orders
+"""
+
+import re as _re
+import unicodedata as _unicodedata
+import weakref as _weakref
+from typing import Dict as _Dict
+from typing import List as _List
+
+import numpy as _np
+import pandas as _pd
+
+# id(df_orders) -> (fingerprint, columns, index), emptied as DataFrames are collected
+_INDEX_CACHE: _Dict[int, tuple] = {}
+
+
+def _normalise(s) -> str:
+    """Internal function to normalise a name or email before indexing:
+    accents removed, case folded and punctuation collapsed to spaces"""
+    if not isinstance(s, str):
+        return ""
+
+    s = _unicodedata.normalize("NFKD", s)
+    s = "".join(c for c in s if not _unicodedata.combining(c)).casefold()
+
+    return " ".join(_re.sub(r"[^\w@]+", " ", s).split())
+
+
+def _trigrams(s: str) -> set:
+    """Internal function to split a normalised string into padded
+    character trigrams"""
+    if not s:
+        return set()
+
+    padded = f"  {s} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _Field:
+    """Internal class holding the trigram postings of a single column"""
+
+    def __init__(self, values) -> None:
+        postings: _Dict[str, _List[int]] = {}
+        sizes = []
+
+        for row, value in enumerate(values):
+            trigrams = _trigrams(_normalise(value))
+            sizes.append(len(trigrams))
+
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(row)
+
+        self.sizes = _np.array(sizes, dtype=_np.int32)
+        self.postings = {
+            trigram: _np.array(rows, dtype=_np.int32)
+            for trigram, rows in postings.items()
+        }
+
+    def scores(self, query: str):
+        """Dice similarity of the query against every row sharing at
+        least one trigram with it"""
+        trigrams = _trigrams(_normalise(query))
+        hits = [self.postings[t] for t in trigrams if t in self.postings]
+
+        if not hits:
+            return _np.empty(0, dtype=_np.int32), _np.empty(0)
+
+        rows, overlap = _np.unique(_np.concatenate(hits), return_counts=True)
+        scores = 2 * overlap / (len(trigrams) + self.sizes[rows])
+
+        return rows, scores
+
+
+class OrderSearchIndex:
+    """Class to hold a trigram index over the names and emails of the
+    respondents"""
+
+    def __init__(self, df_orders: _pd.DataFrame) -> None:
+        """
+        Build the trigram index
+
+        Parameters
+        ----------
+        df_orders: pd.DataFrame
+            The order details converted to a pandas DataFrame
+
+        Returns
+        -------
+        None
+        """
+        for column_name in ["Name", "Email"]:
+            if column_name not in df_orders.columns:
+                raise LookupError(f"{column_name} column not found in input DataFrame")
+
+        self.names = df_orders["Name"].to_numpy(dtype=object)
+        self.emails = df_orders["Email"].to_numpy(dtype=object)
+        self.index = df_orders.index
+        self._names = _Field(self.names)
+        self._emails = _Field(self.emails)
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
+
+    def search(
+        self, query: str, limit: int = 5, min_score: float = 0.3
+    ) -> _pd.DataFrame:
+        """
+        Rank the respondents by similarity to a name or email
+
+        Parameters
+        ----------
+        query : str
+            Name or email address to look for. Queries containing '@' are
+            matched against emails, all others against names.
+        limit : int, optional
+            Maximum number of candidates to return
+        min_score : float, optional
+            Minimum similarity, between 0 and 1, of a candidate
+
+        Returns
+        -------
+        df_matches: pd.DataFrame
+            The candidates, best first, with the row label in df_orders,
+            name, email and similarity score
+        """
+        field = self._emails if "@" in query else self._names
+        rows, scores = field.scores(query)
+
+        keep = scores >= min_score
+        rows, scores = rows[keep], scores[keep]
+
+        # Best score first, ties broken by submission order
+        order = _np.lexsort((rows, -scores))[:limit]
+        rows, scores = rows[order], scores[order]
+
+        return _pd.DataFrame(
+            {
+                "Row": self.index[rows],
+                "Name": self.names[rows],
+                "Email": self.emails[rows],
+                "Score": scores.round(3),
+            }
+        )
+
+
+def _column_key(column: _pd.Series) -> tuple:
+    """Internal function identifying the memory holding a column, in
+    constant time"""
+    values = column.values
+
+    if isinstance(values, _np.ndarray):
+        return values.__array_interface__["data"][0], values.strides, len(values)
+
+    return id(values), len(values)
+
+
+def _copy_on_write() -> bool:
+    """Internal function to check whether pandas copies shared data on
+    write, as it always does from pandas 3"""
+    if int(_pd.__version__.split(".")[0]) >= 3:
+        return True
+    return _pd.options.mode.copy_on_write is True
+
+
+def _fingerprint(df_orders: _pd.DataFrame):
+    """Internal function to detect changes to the indexed columns. With
+    copy on write the columns are not read: the cache holds the indexed
+    columns, so any change to them gives df_orders new memory. Otherwise
+    the columns may be changed in place, so their contents are hashed."""
+    if not _copy_on_write():
+        return int(
+            _pd.util.hash_pandas_object(
+                df_orders[["Name", "Email"]].astype(object), index=True
+            ).sum()
+        )
+
+    return (
+        id(df_orders.index),
+        _column_key(df_orders["Name"]),
+        _column_key(df_orders["Email"]),
+    )
+
+
+def get_search_index(df_orders: _pd.DataFrame) -> OrderSearchIndex:
+    """
+    Return the trigram index of a DataFrame of orders, building it only
+    if it has not been built before or the names/emails have changed.
+    With copy on write, the default from pandas 3, checking for changes
+    takes constant time however many orders there are.
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+
+    Returns
+    -------
+    index : OrderSearchIndex
+        The trigram index of df_orders
+    """
+    key = id(df_orders)
+    fingerprint = _fingerprint(df_orders)
+    cached = _INDEX_CACHE.get(key)
+
+    if cached is not None and cached[0] == fingerprint:
+        return cached[2]
+
+    index = OrderSearchIndex(df_orders)
+
+    # Holding the columns and index keeps their memory, and so the
+    # fingerprint, from being reused while the entry is cached
+    held = (df_orders.index, df_orders["Name"], df_orders["Email"])
+
+    if cached is None:
+        _weakref.finalize(df_orders, _INDEX_CACHE.pop, key, None)
+    _INDEX_CACHE[key] = (fingerprint, held, index)
+
+    return index
+
+
+def search_orders(
+    df_orders: _pd.DataFrame, query: str, limit: int = 5, min_score: float = 0.3
+) -> _pd.DataFrame:
+    """
+    Find the respondents whose name or email is closest to a query,
+    e.g. to recover from typos in a name passed to read_order()
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+    query : str
+        Name or email address to look for. Queries containing '@' are
+        matched against emails, all others against names.
+    limit : int, optional
+        Maximum number of candidates to return
+    min_score : float, optional
+        Minimum similarity, between 0 and 1, of a candidate
+
+    Returns
+    -------
+    df_matches: pd.DataFrame
+        The candidates, best first, with the row label in df_orders,
+        name, email and similarity score
+    """
+    return get_search_index(df_orders).search(query, limit, min_score)
@@ -0,0 +1,374 @@
+"""
+A resident order-query service. The responses are read and indexed once,
+the source file is watched for changes, and order lookups, prices and
+product summaries are answered from memory over a local HTTP/JSON API.
+"""
+
+import json as _json
+import logging as _logging
+import math as _math
+import os as _os
+import threading as _threading
+import time as _time
+from http.server import BaseHTTPRequestHandler as _BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer as _ThreadingHTTPServer
+from typing import Dict as _Dict
+from typing import List as _List
+from urllib.parse import parse_qs as _parse_qs
+from urllib.parse import urlsplit as _urlsplit
+
+import pandas as _pd
+
+from ._catalogue import ORDER_COLUMNS as _ORDER_COLUMNS
+from ._catalogue import PRICING as _PRICING
+from ._catalogue import SIZES as _SIZES
+from .read_orders import Order as _Order
+from .read_orders import _extract_back_names
+from .read_orders import _extract_items
+from .read_orders import _extract_sizings
+from .read_orders import _extract_sleeve_names
+from .read_orders import extract_orders as _extract_orders
+
+_logger = _logging.getLogger(__name__)
+
+
+def _json_value(value):
+    """Internal function to convert cells to JSON-compatible values"""
+    if hasattr(value, "item"):
+        # numpy scalars, e.g. a numeric cell in an item column
+        value = value.item()
+    if value is None or value is _pd.NA:
+        return None
+    if isinstance(value, float) and _math.isnan(value):
+        return None
+    return value
+
+
+def _key(s) -> str:
+    """Internal function to normalise a name or email for lookups"""
+    return s.strip().casefold() if isinstance(s, str) else ""
+
+
+class _Snapshot:
+    """Internal class holding an immutable, fully indexed view of the
+    responses. Readers hold a reference to a single snapshot per request,
+    so a reload never needs to block them."""
+
+    def __init__(self, records: _Dict[int, dict], mtime: int) -> None:
+        self.records = records
+        self.mtime = mtime
+        self.by_name: _Dict[str, _List[dict]] = {}
+        self.by_email: _Dict[str, _List[dict]] = {}
+
+        for record in records.values():
+            self.by_name.setdefault(_key(record["name"]), []).append(record)
+            self.by_email.setdefault(_key(record["email"]), []).append(record)
+
+        self.products = self._summarise_products()
+
+    def _summarise_products(self) -> _List[dict]:
+        """Count every product and sizing across all orders"""
+        counts = {product: dict.fromkeys(_SIZES, 0) for product in _PRICING}
+
+        for record in self.records.values():
+            for product, sizing in zip(
+                record["products"], record["sizings"], strict=True
+            ):
+                if product in counts and sizing in _SIZES:
+                    counts[product][sizing] += 1
+
+        summary = []
+        for product, sizings in counts.items():
+            total_quantity = sum(sizings.values())
+            summary.append(
+                {
+                    "product": product,
+                    "sizings": sizings,
+                    "total_quantity": total_quantity,
+                    "unit_price": _PRICING[product],
+                    "total_price": round(_PRICING[product] * total_quantity, 2),
+                }
+            )
+
+        return summary
+
+
+class OrderIndex:
+    """Class to hold the indexed order responses and keep them up to date
+    with the source file"""
+
+    def __init__(self, filename: str) -> None:
+        """
+        Read and index the order responses
+
+        Parameters
+        ----------
+        filename : str
+            The name of the responses form saved from Microsoft forms
+
+        Returns
+        -------
+        None
+        """
+        self.filename = filename
+        self.snapshot = None
+        self.n_parsed = 0  # Rows parsed by the last reload
+        self._hashes: _Dict[int, int] = {}
+        self._reload_lock = _threading.Lock()
+        self._stop = _threading.Event()
+        self._watcher = None
+
+        self.reload()
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
+
+    def reload(self) -> bool:
+        """
+        Re-read the responses if the source file has changed. Only rows
+        whose contents have changed are re-parsed and re-priced.
+
+        Returns
+        -------
+        reloaded : bool
+            Whether the responses were re-read
+        """
+        with self._reload_lock:
+            mtime = _os.stat(self.filename).st_mtime_ns
+
+            if self.snapshot is not None and mtime == self.snapshot.mtime:
+                return False
+
+            df_orders = _extract_orders(self.filename)
+
+            columns = [column for column in _ORDER_COLUMNS if column in df_orders]
+            hashes = _pd.util.hash_pandas_object(
+                df_orders[columns].astype(object), index=False
+            ).to_numpy()
+
+            previous = self.snapshot.records if self.snapshot is not None else {}
+            previous_rows = {h: row for row, h in self._hashes.items()}
+
+            records = {}
+            n_parsed = 0
+            for row, row_hash in enumerate(hashes.tolist()):
+                old_row = previous_rows.get(row_hash)
+
+                if old_row is not None:
+                    records[row] = dict(previous[old_row], row=row)
+                else:
+                    records[row] = self._parse_row(df_orders, row)
+                    n_parsed += 1
+
+            self._hashes = dict(enumerate(hashes.tolist()))
+            self.snapshot = _Snapshot(records, mtime)
+            self.n_parsed = n_parsed
+
+        _logger.info(
+            "Indexed %d responses from %s (%d re-parsed)",
+            len(records),
+            self.filename,
+            n_parsed,
+        )
+
+        return True
+
+    @staticmethod
+    def _parse_row(df_orders: _pd.DataFrame, row: int) -> dict:
+        """Build and price the order held in a single row"""
+        idx = [row]
+
+        order = _Order(
+            email=df_orders["Email"].iloc[row],
+            name=df_orders["Name"].iloc[row],
+            items=_extract_items(df_orders, idx),
+            sizings=_extract_sizings(df_orders, idx),
+            back_names=_extract_back_names(df_orders, idx),
+            sleeve_names=_extract_sleeve_names(df_orders, idx),
+        )
+        order.update_pricing()
+
+        return {
+            "row": row,
+            "name": _json_value(order.name),
+            "email": _json_value(order.email),
+            "items": [_json_value(item) for item in order.items],
+            "sizings": [_json_value(sizing) for sizing in order.sizings],
+            "back_names": [_json_value(name) for name in order.back_names],
+            "sleeve_names": [_json_value(name) for name in order.sleeve_names],
+            "products": [_json_value(product) for product in order.products],
+            "price": round(order.price, 2),
+        }
+
+    def lookup(self, name: str = None, email: str = None) -> _List[dict]:
+        """
+        Find the orders placed under a name and/or email address
+
+        Parameters
+        ----------
+        name : str, optional
+            The name of the person placing the order
+        email : str, optional
+            The email address of the person placing the order
+
+        Returns
+        -------
+        orders : list
+            The matching orders, in the order they were submitted
+        """
+        snapshot = self.snapshot
+
+        if name is None and email is None:
+            raise ValueError("A name or an email must be given")
+
+        if email is not None:
+            matches = snapshot.by_email.get(_key(email), [])
+            if name is not None:
+                matches = [m for m in matches if _key(m["name"]) == _key(name)]
+        else:
+            matches = snapshot.by_name.get(_key(name), [])
+
+        return matches
+
+    def watch(self, interval: float = 2.0) -> None:
+        """
+        Start a background thread polling the source file for changes
+
+        Parameters
+        ----------
+        interval : float, optional
+            Time in seconds between checks of the source file
+
+        Returns
+        -------
+        None
+        """
+
+        def _poll():
+            while not self._stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    # Keep serving the last good snapshot, e.g. while the
+                    # workbook is only partially written
+                    _logger.warning("Failed to reload %s: %s", self.filename, e)
+
+        self._watcher = _threading.Thread(target=_poll, daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        """Stop watching the source file"""
+        self._stop.set()
+
+
+class _Handler(_BaseHTTPRequestHandler):
+    """Internal request handler answering queries against an OrderIndex"""
+
+    index: OrderIndex = None
+
+    def log_message(self, format, *args):
+        _logger.debug(format, *args)
+
+    def _send(self, status: int, body) -> None:
+        payload = _json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = _urlsplit(self.path)
+        query = {key: values[0] for key, values in _parse_qs(url.query).items()}
+
+        if url.path == "/health":
+            snapshot = self.index.snapshot
+            self._send(200, {"responses": len(snapshot.records)})
+
+        elif url.path == "/products":
+            self._send(200, self.index.snapshot.products)
+
+        elif url.path in ("/orders", "/price"):
+            try:
+                matches = self.index.lookup(query.get("name"), query.get("email"))
+            except ValueError as e:
+                self._send(400, {"error": str(e)})
+                return
+
+            if not matches:
+                self._send(404, {"error": "No matching order found"})
+            elif url.path == "/orders":
+                self._send(200, matches)
+            else:
+                self._send(
+                    200,
+                    [
+                        {"name": m["name"], "email": m["email"], "price": m["price"]}
+                        for m in matches
+                    ],
+                )
+
+        else:
+            self._send(404, {"error": f"Unknown endpoint {url.path}"})
+
+
+def make_server(
+    index: OrderIndex, host: str = "127.0.0.1", port: int = 8000
+) -> _ThreadingHTTPServer:
+    """
+    Create a threaded HTTP server answering queries against an OrderIndex.
+
+    The server provides the endpoints ``/orders?name=...&email=...``,
+    ``/price?name=...&email=...``, ``/products`` and ``/health``.
+
+    Parameters
+    ----------
+    index : OrderIndex
+        The indexed order responses
+    host : str, optional
+        Address to bind the server to
+    port : int, optional
+        Port to listen on, 0 to pick a free port
+
+    Returns
+    -------
+    server : http.server.ThreadingHTTPServer
+        The server, which has not yet been started
+    """
+    handler = type("Handler", (_Handler,), {"index": index})
+    return _ThreadingHTTPServer((host, port), handler)
+
+
+def serve(
+    filename: str, host: str = "127.0.0.1", port: int = 8000, interval: float = 2.0
+) -> None:
+    """
+    Index the order responses and answer queries until interrupted
+
+    Parameters
+    ----------
+    filename : str
+        The name of the responses form saved from Microsoft forms
+    host : str, optional
+        Address to bind the server to
+    port : int, optional
+        Port to listen on
+    interval : float, optional
+        Time in seconds between checks of the source file for changes
+
+    Returns
+    -------
+    None
+    """
+    start = _time.perf_counter()
+    index = OrderIndex(filename)
+    _logger.info("Loaded %s in %.2f s", filename, _time.perf_counter() - start)
+
+    index.watch(interval)
+    server = make_server(index, host, port)
+
+    try:
+        server.serve_forever()
+    finally:
+        index.stop()
+        server.server_close()
@@ -1,7 +1,11 @@
 import pathlib
 
+import numpy
+import pandas
 import pytest
 
+from .helpers import make_orders
+
 
 @pytest.fixture
 def tmp_cwd(tmp_path, monkeypatch) -> pathlib.Path:
@@ -12,3 +16,34 @@ def tmp_cwd(tmp_path, monkeypatch) -> pathlib.Path:
 @pytest.fixture()
 def test_data_dir() -> pathlib.Path:
     return pathlib.Path(__file__).parent / "data"
+
+
+@pytest.fixture()
+def df_orders() -> pandas.DataFrame:
+    nan = numpy.nan
+    return make_orders(
+        [
+            (
+                "John Smith",
+                "john.smith@ed.ac.uk",
+                [
+                    ("Unisex EcoLayer Hoodie", "M", "SMITH", "JS"),
+                    ("Men's EcoLayer Tee (Green)", "L", nan, nan),
+                ],
+            ),
+            (
+                "Jane Doe",
+                "jane.doe@ed.ac.uk",
+                [
+                    ("Women's EcoLayer Tee (Navy)", "S", "DOE", nan),
+                    ("Women's Sublimated Tee (Green)", "xl", nan, "JD"),
+                    ("Unisex Shield Performance Sweatshirt", "2XL", nan, nan),
+                ],
+            ),
+            (
+                "Alex Brown",
+                "alex.brown@ed.ac.uk",
+                [("Men's Sublimated Tee (Navy)", "XS", "BROWN", "AB")],
+            ),
+        ]
+    )
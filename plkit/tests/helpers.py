@@ -0,0 +1,37 @@
+"""Helpers shared by the tests"""
+
+import numpy
+import pandas
+
+from plkit._catalogue import (
+    BACK_NAME_COLUMNS,
+    ITEM_COLUMNS,
+    SIZING_COLUMNS,
+    SLEEVE_NAME_COLUMNS,
+)
+
+
+def make_orders(respondents) -> pandas.DataFrame:
+    """Build a DataFrame laid out like the Microsoft form export from a list of
+    (name, email, [(item, sizing, back name, initials), ...]) tuples."""
+    rows = []
+
+    for n, (name, email, slots) in enumerate(respondents):
+        row = {
+            "ID": n + 1,
+            "Completion time": pandas.Timestamp("2025-01-01")
+            + pandas.Timedelta(hours=n),
+            "Email": email,
+            "Name": name,
+        }
+        slots = list(slots) + [(numpy.nan,) * 4] * (5 - len(slots))
+
+        for i, (item, sizing, back_name, initials) in enumerate(slots):
+            row[ITEM_COLUMNS[i]] = item
+            row[SIZING_COLUMNS[i]] = sizing
+            row[BACK_NAME_COLUMNS[i]] = back_name
+            row[SLEEVE_NAME_COLUMNS[i]] = initials
+
+        rows.append(row)
+
+    return pandas.DataFrame(rows)
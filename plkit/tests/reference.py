@@ -0,0 +1,485 @@
+"""
+Frozen reference implementation of the order processing, copied from the
+original plkit release. The production code is checked against it by
+test_differential.py, so any optimisation must keep its output identical.
+
+Do not edit this module to match new behaviour: it is only updated when a
+deliberate change to the output is made, and nothing here may import from
+the production modules.
+"""
+
+import re as _re
+import unicodedata as _unicodedata
+from typing import List as _List
+
+import numpy as _np
+import pandas as _pd
+
+ORDINALS = ["First", "Second", "Third", "Fourth", "Fifth"]
+
+# unit pricing including VAT
+PRICING = {
+    "Unisex EcoLayer Hoodie": 38.40,  # pounds
+    "Unisex EcoLayer Hoodie - 1 Personalisation": 42.60,
+    "Unisex EcoLayer Hoodie - 2 Personalisations": 46.80,
+    "Unisex Shield Performance Sweatshirt": 36.0,
+    "Unisex Shield Performance Sweatshirt - 1 Personalisation": 40.20,
+    "Unisex Shield Performance Sweatshirt - 2 Personalisations": 44.40,
+    "Men's EcoLayer Tee (Navy)": 18.60,
+    "Men's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
+    "Men's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
+    "Men's EcoLayer Tee (Forest)": 18.60,
+    "Men's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
+    "Men's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
+    "Women's EcoLayer Tee (Navy)": 18.60,
+    "Women's EcoLayer Tee - 1 Personalisation (Navy)": 22.80,
+    "Women's EcoLayer Tee - 2 Personalisations (Navy)": 27.0,
+    "Women's EcoLayer Tee (Forest)": 18.60,
+    "Women's EcoLayer Tee - 1 Personalisation (Forest)": 22.80,
+    "Women's EcoLayer Tee - 2 Personalisations (Forest)": 27.0,
+    "Men's Sublimated Tee (Navy)": 25.62,
+    "Men's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
+    "Men's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
+    "Men's Sublimated Tee (Forest)": 25.62,
+    "Men's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
+    "Men's Sublimated Tee - 2 Personalisations (Forest)": 25.62,
+    "Women's Sublimated Tee (Navy)": 25.62,
+    "Women's Sublimated Tee - 1 Personalisation (Navy)": 25.62,
+    "Women's Sublimated Tee - 2 Personalisations (Navy)": 25.62,
+    "Women's Sublimated Tee (Forest)": 25.62,
+    "Women's Sublimated Tee - 1 Personalisation (Forest)": 25.62,
+    "Women's Sublimated Tee - 2 Personalisations (Forest)": 25.62,
+}
+
+WOMENS_SIZING = {
+    "XS": 6,
+    "S": 8,
+    "M": 10,
+    "L": 12,
+    "XL": 14,
+    "2XL": 16,
+    "3XL": 18,
+    "4XL": 20,
+    "5XL": 22,
+}
+
+
+def _clean_string(s):
+    """Internal function to clean and normalise a string imported from excel."""
+    if isinstance(s, str):
+        # Remove spacing characters
+        s = s.replace("\xa0", " ")
+        # Remove other common invisible characters
+        s = _re.sub(r"[\u200B-\u200D\uFEFF\u00AD]", "", s)
+        # Normalize and strip whitespace
+        s = _unicodedata.normalize("NFKC", s).strip()
+    return s
+
+
+def clean_orders(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    """The cleaning applied by extract_orders() after reading the file"""
+
+    df_orders["Name"] = df_orders["Name"].apply(_clean_string)
+    df_orders["Email"] = df_orders["Email"].apply(_clean_string)
+
+    for number in ORDINALS:
+        column_name = f"{number} kit item"
+        df_orders[column_name] = df_orders[column_name].apply(_clean_string)
+        column_name = f"{number} item - name personalisation for back (optional)"
+        df_orders[column_name] = df_orders[column_name].apply(_clean_string)
+        column_name = (
+            f"{number} item - personalisation for initials (optional, "
+            "max two letters)"
+        )
+        df_orders[column_name] = df_orders[column_name].apply(_clean_string)
+
+    for number in [number.lower() for number in ORDINALS]:
+        column_name = (
+            f"Sizing for {number} kit item (note that for women's tee, "
+            "XS=size 6, S=size 8, ... , 4XL=20)"
+        )
+        df_orders[column_name] = df_orders[column_name].apply(_clean_string)
+
+    return df_orders
+
+
+class Order:
+    """Class to hold information about a single specific order"""
+
+    def __init__(
+        self,
+        email: str,
+        name: str,
+        items: _List[str],
+        sizings: _List[str],
+        back_names: _List[str],
+        sleeve_names: _List[str],
+    ) -> None:
+        self.email = email
+        self.name = name
+        self.items = items
+        self.sizings = sizings
+        self.back_names = back_names
+        self.sleeve_names = sleeve_names
+        self.products = [_np.nan] * 5
+        self.price = _np.nan
+
+        if not (len(items) == len(sizings) == len(back_names) == len(sleeve_names)):
+            raise ValueError("Mismatch in items input!")
+
+        # List to store number of personalisations
+        n_personalisations = [_np.nan] * 5
+
+        for n in range(len(items)):
+            if isinstance(items[n], str):
+                n_personalisations[n] = 0
+
+        for n in range(len(back_names)):
+            if isinstance(back_names[n], str):
+                n_personalisations[n] += 1
+
+        for n in range(len(sleeve_names)):
+            if isinstance(sleeve_names[n], str):
+                n_personalisations[n] += 1
+
+        self.n_personalisations = n_personalisations
+
+    def identify_products(self) -> None:
+        products = [_np.nan] * len(self.items)
+
+        for n in range(len(self.items)):
+            item = self.items[n]
+
+            if isinstance(item, str):
+                # Extract how many personalisations an item has
+                n_personal = self.n_personalisations[n]
+
+                if n_personal == 0:
+                    products[n] = item
+
+                if n_personal == 1:
+                    products[n] = item + " - 1 Personalisation"
+
+                if n_personal == 2:
+                    products[n] = item + " - 2 Personalisations"
+
+        # Replace 'Green' with 'Forest'
+        products = [
+            product.replace("Green", "Forest") if isinstance(product, str) else product
+            for product in products
+        ]
+
+        # Move colour to the end of the product name
+        for i, product in enumerate(products):
+            if isinstance(product, str):
+                for colour in ["Forest", "Navy"]:
+                    if f"({colour})" in product:
+                        products[i] = (
+                            product.replace(f"({colour})", "").strip() + f" ({colour})"
+                        )
+
+        # Clean up double spacing in product name
+        self.products = [
+            product.replace("  ", " ").strip() if isinstance(product, str) else product
+            for product in products
+        ]
+
+    def update_pricing(self) -> None:
+        price = 0
+
+        # Update the product names
+        self.identify_products()
+
+        for product in self.products:
+            if product in PRICING.keys():
+                price += PRICING[product]
+
+        self.price = price
+
+
+def _extract_slots(df_orders: _pd.DataFrame, idx, columns, upper=False):
+    """The _extract_items/_sizings/_back_names/_sleeve_names helpers, which
+    only differed in their columns and whether sizings were upper-cased"""
+
+    values = []
+
+    for column_name in columns:
+        if column_name not in df_orders.columns:
+            raise LookupError(f"{column_name} column not found")
+
+        values.append(df_orders.iloc[idx][column_name].iloc[0])
+
+    # Strip string entries
+    return [
+        (value.strip().upper() if upper else value.strip())
+        if isinstance(value, str)
+        else value
+        for value in values
+    ]
+
+
+ITEM_COLUMNS = [f"{number} kit item" for number in ORDINALS]
+SIZING_COLUMNS = [
+    f"Sizing for {number.lower()} kit item (note that "
+    "for women's tee, XS=size 6, S=size 8, ... , 4XL=20)"
+    for number in ORDINALS
+]
+BACK_NAME_COLUMNS = [
+    f"{number} item - name personalisation for back (optional)" for number in ORDINALS
+]
+SLEEVE_NAME_COLUMNS = [
+    f"{number} item - personalisation for initials (optional, max two letters)"
+    for number in ORDINALS
+]
+
+
+def read_order(df_orders: _pd.DataFrame, name: str, email: str = None):
+    name = name.strip()
+
+    # Check that names column exists
+    if "Name" not in df_orders.columns:
+        raise LookupError("Name column not found in input DataFrame")
+    else:
+        names = df_orders["Name"].to_list()
+
+    # Check that email column exists
+    if "Email" not in df_orders.columns:
+        raise LookupError("Email column not found in input DataFrame")
+
+    # Extract email if not specified
+    if isinstance(email, str):
+        email = email.strip()
+    else:
+        email = df_orders.loc[df_orders["Name"] == name, "Email"].iloc[0]
+
+    name_count = names.count(name)
+
+    if name_count == 0:
+        raise LookupError(f"Name {name} not found!")
+    elif name_count == 1:
+        idx = df_orders[df_orders["Name"] == name].index
+    else:
+        idx = df_orders[
+            (df_orders["Name"] == name) & (df_orders["Email"] == email)
+        ].index
+
+    return Order(
+        email=email,
+        name=name,
+        items=_extract_slots(df_orders, idx, ITEM_COLUMNS),
+        sizings=_extract_slots(df_orders, idx, SIZING_COLUMNS, upper=True),
+        back_names=_extract_slots(df_orders, idx, BACK_NAME_COLUMNS),
+        sleeve_names=_extract_slots(df_orders, idx, SLEEVE_NAME_COLUMNS),
+    )
+
+
+class Product:
+    """Class to hold information about a specific product"""
+
+    def __init__(self, name: str) -> None:
+        self.pricing = dict(PRICING)
+
+        if name not in self.pricing:
+            raise LookupError(f"Item {name} not found.")
+
+        self.name = name
+        self.colour = "Forest" if "Forest" in self.name else "Navy"
+        self.sizings = dict.fromkeys(WOMENS_SIZING, 0)
+        self.total_quantity = 0
+        self.unit_price = self.pricing[name]
+        self.total_price = 0
+
+    def update_count(self, sizing, quantity=1) -> None:
+        if sizing not in self.sizings:
+            raise LookupError(f"Sizing {sizing} not found")
+
+        self.sizings[sizing] += quantity
+        self.total_quantity += quantity
+        self.total_price = self.unit_price * self.total_quantity
+
+    def update_product(self, order) -> None:
+        # Update product names
+        order.identify_products()
+
+        # Loop over every item stored in order and update where appropriate
+        for n in range(len(order.items)):
+            product_name = order.products[n]
+            sizing = order.sizings[n]
+
+            # Check for valid product name and sizing
+            if isinstance(product_name, str) and product_name.strip() == self.name:
+                if isinstance(sizing, str) and sizing.strip() in self.sizings:
+                    self.update_count(sizing.strip())
+
+
+def _update_df_products(df_products, product) -> _pd.DataFrame:
+    product_name = product.name.replace("(Forest)", "").replace("(Navy)", "").strip()
+
+    new_row = {
+        "Product Name": product_name,
+        "Colour": product.colour,
+        "Total Quantity": product.total_quantity,
+        "Unit Price (£)": product.unit_price,
+        "Total Price (£)": product.total_price,
+    }
+
+    for sizing in WOMENS_SIZING:
+        size_key = WOMENS_SIZING[sizing] if "Women's" in product_name else sizing
+        new_row[size_key] = product.sizings.get(sizing, 0)
+
+    return _pd.concat([df_products, _pd.DataFrame([new_row])], ignore_index=True)
+
+
+PRODUCT_COLUMNS = (
+    ["Product Name", "Colour", "Total Quantity"]
+    + list(WOMENS_SIZING)
+    + list(WOMENS_SIZING.values())
+    + ["Unit Price (£)", "Total Price (£)"]
+)
+
+
+def generate_product_order(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    # Names of all people who submitted an order
+    names = df_orders["Name"].to_list()
+
+    columns = PRODUCT_COLUMNS
+    df_products = _pd.DataFrame(columns=columns)
+
+    for item in PRICING:
+        product = Product(item)  # Initialise empty class
+
+        for name in names:  # Populate product with the info from all orders
+            order = read_order(df_orders, name)
+            order.identify_products()
+            product.update_product(order)
+
+        df_products = _update_df_products(df_products, product)
+
+    # Add total pricing row
+    count_all_items = _np.sum(df_products["Total Quantity"].to_numpy())
+    total_price = _np.sum(df_products["Total Price (£)"].to_numpy())
+
+    new_row = [_np.nan] * len(columns)
+    new_row[2] = count_all_items
+    new_row[-1] = total_price
+    df_products.loc[len(df_products)] = new_row
+    df_products.iloc[-1, -2] = "Total"  # Add label for total
+
+    # Add label for club name
+    new_row = [_np.nan] * len(columns)
+    df_products.loc[len(df_products)] = new_row
+    df_products.iloc[-1, 1] = "Club Name"
+    df_products.iloc[-1, 2] = "Badminton"
+
+    return df_products
+
+
+PERSONALISATION_COLUMNS = [
+    "Product Name",
+    "Size",
+    "Colour",
+    "Initials (sleeve personalisation)",
+    "Name (back personalisation)",
+]
+
+
+def generate_product_personalisations(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    # Names of all people who submitted an order
+    names = df_orders["Name"].to_list()
+
+    df_personal = _pd.DataFrame(columns=PERSONALISATION_COLUMNS)
+
+    for name in names:  # Populate product with the info from all orders
+        order = read_order(df_orders, name)
+        order.identify_products()
+
+        for n in range(len(order.items)):
+            product_name = order.products[n]
+
+            if isinstance(product_name, str):
+                product_name = product_name.strip()
+                sizing = order.sizings[n]
+
+                new_row = {
+                    "Product Name": product_name,
+                    "Size": WOMENS_SIZING.get(sizing, sizing)
+                    if "Women's" in product_name
+                    else sizing,
+                    "Colour": "Forest" if "Forest" in product_name else "Navy",
+                    "Initials (sleeve personalisation)": order.sleeve_names[n],
+                    "Name (back personalisation)": order.back_names[n],
+                }
+
+                # Only add column for personalised item
+                if isinstance(order.sleeve_names[n], str) or isinstance(
+                    order.back_names[n], str
+                ):
+                    df_personal = _pd.concat(
+                        [df_personal, _pd.DataFrame([new_row])], ignore_index=True
+                    )
+
+    return df_personal
+
+
+def _count_initial(df_orders: _pd.DataFrame, attribute: str) -> int:
+    """The count_initial_* validation counters, which only differed in the
+    Order attribute counted"""
+    item_count = 0
+
+    # Check that names column exists
+    if "Name" not in df_orders.columns:
+        raise LookupError("Name column not found in input DataFrame")
+    else:
+        names = df_orders["Name"].to_list()
+
+    for name in names:
+        if isinstance(name, str):
+            order = read_order(df_orders, name)
+
+            for item in getattr(order, attribute):
+                if isinstance(item, str):
+                    item_count += 1
+
+        else:
+            raise ValueError(f"Non-string name {name} detected!")
+
+    return int(item_count)
+
+
+def count_initial_order(df_orders: _pd.DataFrame) -> int:
+    return _count_initial(df_orders, "items")
+
+
+def count_initial_back_personalisations(df_orders: _pd.DataFrame) -> int:
+    return _count_initial(df_orders, "back_names")
+
+
+def count_initial_sleeve_personalisations(df_orders: _pd.DataFrame) -> int:
+    return _count_initial(df_orders, "sleeve_names")
+
+
+def count_processed_order(df_products: _pd.DataFrame) -> int:
+    # Check that names column exists
+    if "Product Name" not in df_products.columns:
+        raise LookupError("Product column not found in input DataFrame")
+    else:
+        products = df_products["Product Name"].to_list()
+        # Drop NaN rows
+        products = [product for product in products if isinstance(product, str)]
+
+    # Sum over all size cells that contain item counts
+    sum = df_products.iloc[0 : len(products), 3:-2].sum(axis=1)
+
+    return int(sum.sum())
+
+
+def count_processed_back_personalisations(df_personal: _pd.DataFrame) -> int:
+    back_names = df_personal["Name (back personalisation)"].to_list()
+
+    return len([name for name in back_names if isinstance(name, str)])
+
+
+def count_processed_sleeve_personalisations(df_personal: _pd.DataFrame) -> int:
+    sleeve_names = df_personal["Initials (sleeve personalisation)"].to_list()
+
+    return len([name for name in sleeve_names if isinstance(name, str)])
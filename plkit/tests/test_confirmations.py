@@ -0,0 +1,31 @@
+import pandas
+import pytest
+
+import plkit
+
+
+def test_price_orders(df_orders):
+    df_prices = plkit.price_orders(df_orders)
+
+    for name, price in zip(
+        df_prices["Name"], df_prices["Total Price (£)"], strict=True
+    ):
+        order = plkit.read_order(df_orders, name)
+        order.update_pricing()
+        assert price == pytest.approx(order.price)
+
+
+@pytest.mark.parametrize("fmt", ["txt", "html", "csv"])
+def test_generate_confirmations(df_orders, tmp_cwd, fmt):
+    df_summary = plkit.generate_confirmations(df_orders, "out", fmt=fmt)
+
+    assert list(df_summary["Items"]) == [2, 3, 1]
+    assert (tmp_cwd / "out" / "summary.csv").exists()
+
+    contents = (tmp_cwd / "out" / f"0002_jane_doe.{fmt}").read_text()
+    assert "DOE" in contents
+    assert "84.42" in contents
+
+    if fmt == "csv":
+        df = pandas.read_csv(tmp_cwd / "out" / "0001_john_smith.csv")
+        assert df["Price (£)"].iloc[-1] == pytest.approx(46.80 + 18.60)
@@ -0,0 +1,53 @@
+import numpy
+import pandas
+
+import plkit
+from plkit._catalogue import SLEEVE_NAME_COLUMNS
+
+
+def test_diff_exports(df_orders):
+    df_new = df_orders.drop(index=2).reset_index(drop=True)
+    df_new.loc[0, SLEEVE_NAME_COLUMNS[0]] = numpy.nan
+    df_new = pandas.concat(
+        [df_new, df_orders.iloc[[2]].assign(Email="sam.lee@ed.ac.uk", Name="Sam Lee")],
+        ignore_index=True,
+    )
+
+    df_changes, df_delta = plkit.diff_exports(df_orders, df_new)
+
+    assert list(df_changes["Status"]) == ["changed", "removed", "added"]
+    assert list(df_changes["Price Change (£)"]) == [-4.2, -25.62, 25.62]
+
+    # The delta is the difference of the two product order tables
+    def _sizes(df_products):
+        return df_products.iloc[:-2, 3:-2].fillna(0).astype(int)
+
+    sizes = _sizes(plkit.generate_product_order(df_new))
+    sizes -= _sizes(plkit.generate_product_order(df_orders))
+    assert (df_delta.iloc[:-1, 3:-2].fillna(0).astype(int) == sizes).all().all()
+    assert df_delta["Total Quantity"].iloc[-1] == 0
+
+
+def test_diff_exports_repeated_name(df_orders):
+    # A second John Smith, with another email, orders a different item
+    df_new = pandas.concat(
+        [
+            df_orders,
+            df_orders.iloc[[2]].assign(Name="John Smith", Email="js2@ed.ac.uk"),
+        ],
+        ignore_index=True,
+    )
+
+    df_changes, df_delta = plkit.diff_exports(df_orders, df_new)
+
+    assert list(df_changes["Status"]) == ["added"]
+
+    # As in generate_product_order(), the first John Smith is counted again
+    df_products = plkit.generate_product_order(df_new)
+    df_products_old = plkit.generate_product_order(df_orders)
+    expected = (
+        df_products["Total Quantity"].iloc[:-2]
+        - df_products_old["Total Quantity"].iloc[:-2]
+    )
+    assert list(df_delta["Total Quantity"].iloc[:-1]) == list(expected)
+    assert df_delta["Total Quantity"].iloc[-1] == 2
@@ -0,0 +1,336 @@
+"""
+Differential tests of the production order processing against the frozen
+reference implementation in reference.py, on randomly generated response
+sheets. The optimised paths promising identical output, price_orders() and
+plkit.lite, are checked against the reference too. A failing sheet is shrunk
+to a minimal set of responses which still shows the difference before it is
+reported.
+"""
+
+import os
+import random
+import tempfile
+
+import numpy
+import pandas
+import pytest
+
+import plkit
+from plkit import lite
+from plkit.read_orders import _clean_orders
+
+from . import reference
+
+FORM_ITEMS = [
+    "Unisex EcoLayer Hoodie",
+    "Unisex Shield Performance Sweatshirt",
+    "Men's EcoLayer Tee (Navy)",
+    "Men's EcoLayer Tee (Green)",
+    "Women's EcoLayer Tee (Navy)",
+    "Women's EcoLayer Tee (Green)",
+    "Men's Sublimated Tee (Navy)",
+    "Men's Sublimated Tee (Green)",
+    "Women's Sublimated Tee (Navy)",
+    "Women's Sublimated Tee (Green)",
+    # Quirky spellings seen in real exports, and an item no longer sold
+    "Men's  EcoLayer Tee (Green) ",
+    "Women's\xa0Sublimated Tee (Navy)",
+    "Unisex EcoLayer\u200b Hoodie",
+    "Club Scarf",
+]
+
+SIZES = ["XS", "S", "M", "L", "XL", "2XL", "3XL", "4XL", "5XL"]
+ODD_SIZES = ["xl", " m ", "2xl\xa0", "8", "XXL", ""]
+
+NAMES = [
+    "John Smith",
+    "Zoë Ångström",
+    "José\xa0García",
+    "\u200bAli Khan",
+    "李小龙",
+    "Siobhán O'Neill ",
+    "Ｊａｎｅ Ｄｏｅ",
+    "Anne-Marie Lee",
+]
+
+PERSONALISATIONS = ["SMITH", "Zoë", "O'NEILL", "ab", "JS", "É", " kh ", "NA", "李"]
+
+
+def random_responses(seed: int, n: int) -> pandas.DataFrame:
+    """Generate n random responses laid out like the Microsoft form export,
+    with empty slots, repeated names, unusual unicode and women's sizes"""
+    rng = random.Random(seed)
+    rows = []
+
+    for i in range(n):
+        # Small pools so that names, and sometimes emails, repeat
+        name = rng.choice(NAMES[: max(2, n // 3)] + [f"Person {i}"])
+        email = rng.choice([f"p{i}@ed.ac.uk", f"{i % 3}@ed.ac.uk", " P@ED.AC.UK "])
+        row = {"ID": i + 1, "Email": email, "Name": name}
+
+        n_items = rng.randint(0, 5)
+        for j in range(5):
+            filled = j < n_items
+
+            item = rng.choice(FORM_ITEMS) if filled else numpy.nan
+            sizing = numpy.nan
+            if filled and rng.random() < 0.95:
+                sizing = rng.choice(SIZES if rng.random() < 0.85 else ODD_SIZES)
+
+            back_name = numpy.nan
+            if filled and rng.random() < 0.5:
+                back_name = rng.choice(PERSONALISATIONS)
+
+            initials = numpy.nan
+            if filled and rng.random() < 0.5:
+                initials = rng.choice(PERSONALISATIONS)
+
+            row[reference.ITEM_COLUMNS[j]] = item
+            row[reference.SIZING_COLUMNS[j]] = sizing
+            row[reference.BACK_NAME_COLUMNS[j]] = back_name
+            row[reference.SLEEVE_NAME_COLUMNS[j]] = initials
+
+        rows.append(row)
+
+    columns = (
+        ["ID", "Email", "Name"]
+        + reference.ITEM_COLUMNS
+        + reference.SIZING_COLUMNS
+        + reference.BACK_NAME_COLUMNS
+        + reference.SLEEVE_NAME_COLUMNS
+    )
+
+    return pandas.DataFrame(rows, columns=columns, dtype=object)
+
+
+def _outcome(func, *args):
+    """Result of a call, or the type of the exception it raised"""
+    try:
+        return "ok", func(*args)
+    except Exception as e:
+        return "error", type(e).__name__
+
+
+def _same(expected, actual) -> bool:
+    if expected[0] != actual[0]:
+        return False
+
+    if isinstance(expected[1], pandas.DataFrame):
+        try:
+            pandas.testing.assert_frame_equal(actual[1], expected[1])
+        except AssertionError:
+            return False
+        return True
+
+    return expected[1] == actual[1]
+
+
+def _prices(module, df_orders):
+    prices = []
+
+    for name in df_orders["Name"]:
+        order = module.read_order(df_orders, name)
+        order.update_pricing()
+        prices.append((order.products, order.price))
+
+    return prices
+
+
+def _response_prices(df_orders):
+    """Number of items and price of every response as-is, which
+    price_orders() computes at once"""
+    prices = []
+
+    for row in range(len(df_orders)):
+        order = reference.Order(
+            email=df_orders["Email"].iloc[row],
+            name=df_orders["Name"].iloc[row],
+            items=reference._extract_slots(df_orders, [row], reference.ITEM_COLUMNS),
+            sizings=reference._extract_slots(
+                df_orders, [row], reference.SIZING_COLUMNS, upper=True
+            ),
+            back_names=reference._extract_slots(
+                df_orders, [row], reference.BACK_NAME_COLUMNS
+            ),
+            sleeve_names=reference._extract_slots(
+                df_orders, [row], reference.SLEEVE_NAME_COLUMNS
+            ),
+        )
+        order.update_pricing()
+        prices.append(
+            (sum(isinstance(item, str) for item in order.items), round(order.price, 2))
+        )
+
+    return prices
+
+
+def _price_orders(df_orders):
+    df_prices = plkit.price_orders(df_orders)
+    return list(zip(df_prices["Items"], df_prices["Total Price (£)"], strict=True))
+
+
+def _reference_csv(df_orders):
+    """The order sheets as written by 'plkit generate'"""
+    return (
+        reference.generate_product_order(df_orders).to_csv(index=False),
+        reference.generate_product_personalisations(df_orders).to_csv(index=False),
+    )
+
+
+def _lite_csv(df_raw):
+    """The order sheets written by plkit.lite from a CSV export"""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "responses.csv")
+        df_raw.to_csv(filename, index=False)
+        orders = lite.extract_orders(filename)
+
+        sheets = []
+        for rows, columns in [
+            (lite.generate_product_order(orders), lite.PRODUCT_COLUMNS),
+            (
+                lite.generate_product_personalisations(orders),
+                lite.PERSONALISATION_COLUMNS,
+            ),
+        ]:
+            lite.write_csv(rows, filename, columns)
+            with open(filename, encoding="utf-8") as f:
+                sheets.append(f.read())
+
+    return tuple(sheets)
+
+
+def differences(df_raw: pandas.DataFrame) -> list:
+    """Names of the checks in which production and reference differ"""
+    df_expected = reference.clean_orders(df_raw.copy())
+    df_actual = _clean_orders(df_raw.copy())
+
+    if not _same(("ok", df_expected), ("ok", df_actual)):
+        return ["clean_orders"]
+
+    checks = [
+        (
+            "generate_product_order",
+            reference.generate_product_order,
+            plkit.generate_product_order,
+        ),
+        (
+            "generate_product_personalisations",
+            reference.generate_product_personalisations,
+            plkit.generate_product_personalisations,
+        ),
+        (
+            "update_pricing",
+            lambda df: _prices(reference, df),
+            lambda df: _prices(plkit.read_orders, df),
+        ),
+        ("price_orders", _response_prices, _price_orders),
+        ("lite", _reference_csv, lambda df: _lite_csv(df_raw)),
+        (
+            "count_initial_order",
+            reference.count_initial_order,
+            plkit.count_initial_order,
+        ),
+        (
+            "count_initial_back_personalisations",
+            reference.count_initial_back_personalisations,
+            plkit.count_initial_back_personalisations,
+        ),
+        (
+            "count_initial_sleeve_personalisations",
+            reference.count_initial_sleeve_personalisations,
+            plkit.count_initial_sleeve_personalisations,
+        ),
+    ]
+
+    failed = []
+    outputs = {}
+
+    for name, expected_func, actual_func in checks:
+        expected = _outcome(expected_func, df_expected)
+        if not _same(expected, _outcome(actual_func, df_actual)):
+            failed.append(name)
+        outputs[name] = expected
+
+    # The processed counters are checked on the reference outputs
+    for name, source, expected_func, actual_func in [
+        (
+            "count_processed_order",
+            "generate_product_order",
+            reference.count_processed_order,
+            plkit.count_processed_order,
+        ),
+        (
+            "count_processed_back_personalisations",
+            "generate_product_personalisations",
+            reference.count_processed_back_personalisations,
+            plkit.count_processed_back_personalisations,
+        ),
+        (
+            "count_processed_sleeve_personalisations",
+            "generate_product_personalisations",
+            reference.count_processed_sleeve_personalisations,
+            plkit.count_processed_sleeve_personalisations,
+        ),
+    ]:
+        if outputs[source][0] == "ok":
+            df_source = outputs[source][1]
+            if not _same(
+                _outcome(expected_func, df_source), _outcome(actual_func, df_source)
+            ):
+                failed.append(name)
+
+    return failed
+
+
+def shrink(df_raw: pandas.DataFrame, fails) -> pandas.DataFrame:
+    """Remove responses, in progressively smaller chunks, for as long as
+    the sheet still fails"""
+    chunk = max(1, len(df_raw) // 2)
+
+    while True:
+        start = 0
+        while start < len(df_raw):
+            candidate = df_raw.drop(df_raw.index[start : start + chunk])
+            candidate = candidate.reset_index(drop=True)
+
+            if fails(candidate):
+                df_raw = candidate
+            else:
+                start += chunk
+
+        if chunk == 1:
+            return df_raw
+        chunk //= 2
+
+
+def _describe(df_raw: pandas.DataFrame) -> str:
+    """Compact listing of the filled cells of every response"""
+    return "\n".join(
+        repr({key: value for key, value in row.items() if isinstance(value, str)})
+        for row in df_raw.to_dict("records")
+    )
+
+
+# The reference is quadratic in the number of responses, so sizes are small
+@pytest.mark.parametrize(
+    "seed, n", [(seed, n) for n in [1, 4] for seed in range(3)] + [(0, 12)]
+)
+def test_matches_reference(seed, n):
+    df_raw = random_responses(seed, n)
+    failed = differences(df_raw)
+
+    if failed:
+        df_minimal = shrink(df_raw, lambda df: bool(set(failed) & set(differences(df))))
+        pytest.fail(
+            f"Production differs from reference in {failed}, "
+            f"minimal failing responses:\n{_describe(df_minimal)}"
+        )
+
+
+def test_shrink():
+    df_raw = random_responses(0, 20)
+
+    def fails(df):
+        return (df["ID"] == 7).any() and (df["ID"] == 13).any()
+
+    assert sorted(shrink(df_raw, fails)["ID"]) == [7, 13]
@@ -0,0 +1,56 @@
+import pandas
+import pytest
+
+import plkit
+from plkit._catalogue import SIZING_COLUMNS, SLEEVE_NAME_COLUMNS
+
+pytest.importorskip("pyarrow")
+
+
+def test_archive_and_query_history(df_orders, tmp_path):
+    root = str(tmp_path / "history")
+
+    assert plkit.archive_orders(df_orders, root, "2023 Kit", 2023) == 6
+    assert plkit.archive_orders(df_orders.iloc[:1], root, "2024 Kit", 2024) == 2
+
+    df_history = plkit.query_history(root)
+    assert len(df_history) == 8
+    assert set(df_history["Campaign"]) == {"2023 Kit", "2024 Kit"}
+
+    # Projection and partition filter
+    df_history = plkit.query_history(
+        root, ["Year", "Product", "Size"], [("Year", ">=", 2024)]
+    )
+    assert list(df_history.columns) == ["Year", "Product", "Size"]
+    assert list(df_history["Year"]) == [2024, 2024]
+
+    # Archiving a campaign again replaces it
+    plkit.archive_orders(df_orders.iloc[1:], root, "2024 Kit", 2024)
+    df_history = plkit.query_history(root, filters=[("Campaign", "=", "2024 Kit")])
+    assert list(df_history["Name"].unique()) == ["Jane Doe", "Alex Brown"]
+
+    # ... including when it was archived under another year
+    plkit.archive_orders(df_orders.iloc[:1], root, "2024 Kit", 2025)
+    df_history = plkit.query_history(root, filters=[("Campaign", "=", "2024 Kit")])
+    assert list(df_history["Year"]) == [2025, 2025]
+    assert len(plkit.query_history(root)) == 8
+    assert not (tmp_path / "history" / "Campaign=2024%20Kit" / "Year=2024").exists()
+
+    with pytest.raises(LookupError):
+        plkit.query_history(root, ["Colour"])
+
+
+def test_archive_numeric_cells(df_orders, tmp_path):
+    root = str(tmp_path / "history")
+
+    # Cells which Excel reads as numbers
+    df_orders = df_orders.astype(object)
+    df_orders.loc[0, SLEEVE_NAME_COLUMNS[0]] = 12
+    df_orders.loc[2, SIZING_COLUMNS[0]] = 8
+
+    assert plkit.archive_orders(df_orders, root, "2024 Kit", 2024) == 6
+
+    df_history = plkit.query_history(root, ["Initials", "Size"])
+    assert df_history["Initials"].iloc[0] == "12"
+    assert pandas.isna(df_history["Initials"].iloc[1])
+    assert df_history["Size"].iloc[-1] == "8"
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from plkit._cli import main
+
+
+def test_lite_matches_pandas(df_orders, tmp_cwd):
+    df_orders.loc[1, "Name"] = "John Smith"  # duplicate names resolve identically
+    df_orders.to_csv("responses.csv", index=False)
+
+    runner = CliRunner()
+    for args in [["-o", "lite"], ["-o", "pandas", "--pandas"]]:
+        result = runner.invoke(main, ["generate", "responses.csv", *args])
+        assert result.exit_code == 0, result.output
+
+    for filename in ["products.csv", "personalisations.csv"]:
+        assert (tmp_cwd / "lite" / filename).read_text() == (
+            tmp_cwd / "pandas" / filename
+        ).read_text()
+
+
+def test_lite_does_not_import_pandas(tmp_cwd):
+    code = "import sys, plkit.lite; assert 'pandas' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lite_matches_pandas_without_items(df_orders, tmp_cwd):
+    for column in df_orders.columns:
+        if "kit item" in column:
+            df_orders[column] = None
+    df_orders.to_csv("responses.csv", index=False)
+
+    runner = CliRunner()
+    for args in [["-o", "lite"], ["-o", "pandas", "--pandas"]]:
+        result = runner.invoke(main, ["generate", "responses.csv", *args])
+        assert result.exit_code == 0, result.output
+
+    assert (tmp_cwd / "lite" / "products.csv").read_text() == (
+        tmp_cwd / "pandas" / "products.csv"
+    ).read_text()
@@ -0,0 +1,54 @@
+import pandas
+
+import plkit
+
+
+def test_match_payments(df_orders):
+    df_orders = pandas.concat(
+        [
+            df_orders,
+            # A second response from Alex, paid for separately
+            df_orders.iloc[[2]].assign(ID=4),
+        ],
+        ignore_index=True,
+    )
+
+    df_payments = pandas.DataFrame(
+        {
+            "Name": ["MR J SMITH", "DOE JANE", "A Brown", "Someone", "", "Refund"],
+            "Reference": ["", "", "", "kit", "Order 4", ""],
+            "Amount": ["£65.40", "50.00", "25.62", "10", "25.62", "-5"],
+        }
+    )
+
+    matches = plkit.match_payments(df_orders, df_payments)
+
+    assert list(matches["paid"]["Name"]) == ["John Smith", "Alex Brown"]
+    assert list(matches["paid"]["Payments"]) == [1, 2]
+    assert list(matches["paid"]["Matched By"]) == [
+        "closest name",
+        "closest name, reference",
+    ]
+    assert list(matches["underpaid"]["Balance (£)"]) == [-34.42]
+    assert list(matches["underpaid"]["Matched By"]) == ["name"]
+    assert len(matches["overpaid"]) == len(matches["unpaid"]) == 0
+    assert list(matches["unmatched"]["Name"]) == ["Someone"]
+
+
+def test_match_payments_reference_ids(df_orders):
+    df_orders = df_orders.assign(ID=[4, 2025, 7])
+
+    df_payments = pandas.DataFrame(
+        {
+            "Name": ["Stranger", "Other Stranger", "Third Stranger"],
+            "Reference": ["Kit order 2025", "ID #4", "7"],
+            "Amount": ["10", "65.40", "25.62"],
+        }
+    )
+
+    matches = plkit.match_payments(df_orders, df_payments)
+
+    # Numbers within a longer reference, e.g. a year, are not response IDs
+    assert list(matches["unmatched"]["Reference"]) == ["Kit order 2025"]
+    assert list(matches["paid"]["Name"]) == ["John Smith", "Alex Brown"]
+    assert list(matches["paid"]["Matched By"]) == ["reference", "reference"]
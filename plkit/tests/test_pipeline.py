@@ -0,0 +1,70 @@
+import pandas
+import pytest
+
+import plkit
+from plkit.pipeline import Pipeline
+
+
+def test_extract_order_lines(df_orders):
+    df_lines = plkit.extract_order_lines(df_orders)
+
+    assert list(df_lines["Row"]) == [0, 0, 1, 1, 1, 2]
+    assert list(df_lines["Product"]) == [
+        "Unisex EcoLayer Hoodie - 2 Personalisations",
+        "Men's EcoLayer Tee (Forest)",
+        "Women's EcoLayer Tee - 1 Personalisation (Navy)",
+        "Women's Sublimated Tee - 1 Personalisation (Forest)",
+        "Unisex Shield Performance Sweatshirt",
+        "Men's Sublimated Tee - 2 Personalisations (Navy)",
+    ]
+    assert df_lines["Size"].iloc[3] == "XL"
+
+
+def test_pipeline_recomputes_invalidated_stages(df_orders, tmp_cwd):
+    df_orders.to_excel("responses.xlsx", index=False)
+    pipeline = Pipeline()
+
+    outputs = pipeline.run(filename="responses.xlsx", output_dir="out", format="csv")
+    assert pipeline.recomputed == [stage.name for stage in pipeline.stages]
+    assert outputs["validate"]["counts"]["Passed"].all()
+    assert len(outputs["validate"]["violations"]) == 0
+    pandas.testing.assert_frame_equal(
+        outputs["products"], plkit.generate_product_order(df_orders)
+    )
+
+    pipeline.run(filename="responses.xlsx", output_dir="out", format="xlsx")
+    assert pipeline.recomputed == ["export"]
+    assert (tmp_cwd / "out" / "products.xlsx").exists()
+
+    df_orders.loc[2, "First kit item"] = "Unisex EcoLayer Hoodie"
+    df_orders.to_excel("responses.xlsx", index=False)
+
+    pipeline.run(filename="responses.xlsx", output_dir="out", format="xlsx")
+    assert "products" in pipeline.recomputed
+
+
+def test_watch_survives_missing_file(df_orders, tmp_cwd, monkeypatch):
+    runs = []
+    sleeps = []
+
+    class _Stop(Exception):
+        pass
+
+    def _sleep(interval):
+        # The export appears after the first poll, then watching stops
+        sleeps.append(interval)
+        if len(sleeps) == 1:
+            df_orders.to_csv("responses.csv", index=False)
+        if len(sleeps) == 2:
+            raise _Stop
+
+    monkeypatch.setattr(plkit.pipeline._time, "sleep", _sleep)
+
+    with pytest.raises(_Stop):
+        plkit.pipeline.watch("responses.csv", output_dir="out", callback=runs.append)
+
+    assert len(runs) == 1
+
+    # CSV timestamps are parsed as in extract_orders()
+    outputs = runs[0].run(filename="responses.csv", output_dir="out", format="csv")
+    assert pandas.api.types.is_datetime64_dtype(outputs["clean"]["Completion time"])
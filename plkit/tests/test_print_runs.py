@@ -0,0 +1,42 @@
+import pandas
+
+import plkit
+
+
+def test_generate_print_runs(df_orders):
+    df_personal = plkit.generate_product_personalisations(df_orders)
+    # Every garment ordered twice over, in reverse order
+    df_personal = pandas.concat([df_personal, df_personal[::-1]], ignore_index=True)
+
+    df_runs, df_summary = plkit.generate_print_runs(df_personal)
+
+    assert df_runs["Quantity"].sum() == len(df_personal)
+    assert (df_runs["Quantity"] == 2).all()
+    assert df_summary["Garments"].sum() == len(df_personal)
+    assert df_summary["Distinct Personalisations"].sum() == len(df_runs)
+
+    # Runs are sorted by product, colour and size, with no duplicates
+    keys = ["Product Name", "Colour", "Size"]
+    assert not df_summary.duplicated(keys).any()
+    assert list(df_summary["Product Name"]) == sorted(df_summary["Product Name"])
+    garments = df_runs.groupby("Run")["Quantity"].sum()
+    assert list(garments) == list(df_summary["Garments"])
+
+
+def test_generate_print_runs_empty(df_orders):
+    df_personal = plkit.generate_product_personalisations(df_orders.iloc[:0])
+    df_runs, df_summary = plkit.generate_print_runs(df_personal)
+
+    assert len(df_runs) == 0 and len(df_summary) == 0
+
+
+def test_generate_print_runs_unknown_sizes(df_orders):
+    df_personal = plkit.generate_product_personalisations(df_orders).iloc[[0] * 5]
+    df_personal["Size"] = ["6XL", None, "XXL", "6XL", "M"]
+
+    df_runs, df_summary = plkit.generate_print_runs(df_personal)
+
+    # Garments of unknown sizes are never merged with another size
+    assert list(df_runs["Size"].fillna("")) == ["M", "6XL", "XXL", ""]
+    assert list(df_runs["Quantity"]) == [1, 2, 1, 1]
+    assert list(df_summary["Garments"]) == [1, 2, 1, 1]
@@ -0,0 +1,93 @@
+import pandas
+import pytest
+
+import plkit
+from plkit._catalogue import ITEM_COLUMNS, SIZING_COLUMNS
+from plkit.read_orders import compact_orders
+
+
+def test_compact_orders(df_orders):
+    df_compact = compact_orders(df_orders)
+
+    item_dtypes = {df_compact[column].dtype for column in ITEM_COLUMNS}
+    sizing_dtypes = {df_compact[column].dtype for column in SIZING_COLUMNS}
+
+    assert len(item_dtypes) == 1
+    assert isinstance(item_dtypes.pop(), pandas.CategoricalDtype)
+    assert len(sizing_dtypes) == 1
+    assert isinstance(df_compact["Name"].dtype, pandas.StringDtype)
+    assert set(df_compact.attrs["memory_usage"]) == {"before", "after"}
+
+    pandas.testing.assert_frame_equal(
+        plkit.generate_product_order(df_compact),
+        plkit.generate_product_order(df_orders),
+    )
+    pandas.testing.assert_frame_equal(
+        plkit.generate_product_personalisations(df_compact),
+        plkit.generate_product_personalisations(df_orders),
+    )
+
+    order = plkit.read_order(df_compact, "Jane Doe")
+    order.update_pricing()
+
+    assert order.price == pytest.approx(22.80 + 25.62 + 36.0)
+
+
+def test_orders_between(df_orders):
+    # Responses are an hour apart from 2025-01-01 00:00
+    df_window = plkit.orders_between(df_orders, "2025-01-01 00:30", "2025-01-01 02:00")
+    assert list(df_window["Name"]) == ["Jane Doe"]
+    assert list(plkit.orders_between(df_orders, end="2025-01-01 01:00").index) == [0]
+    assert len(plkit.orders_between(df_orders, start="2025-01-02")) == 0
+
+    # Out of order and missing timestamps
+    df_shuffled = df_orders.iloc[[2, 0, 1]].copy()
+    df_shuffled.loc[1, "Completion time"] = pandas.NaT
+    df_window = plkit.orders_between(df_shuffled, start="2025-01-01")
+    assert list(df_window.index) == [2, 0]
+
+    # Aggregating a window matches aggregating the selected responses
+    pandas.testing.assert_frame_equal(
+        plkit.generate_product_order(df_orders, start="2025-01-01 01:00"),
+        plkit.generate_product_order(df_orders.iloc[1:].reset_index(drop=True)),
+    )
+    pandas.testing.assert_frame_equal(
+        plkit.generate_product_personalisations(df_orders, end="2025-01-01 02:00"),
+        plkit.generate_product_personalisations(df_orders.iloc[:2]),
+    )
+
+
+def test_provenance(df_orders):
+    # John Smith orders again under the same name and email
+    df_orders = pandas.concat([df_orders, df_orders.iloc[[0]]], ignore_index=True)
+
+    df_products, provenance = plkit.generate_product_order(df_orders, provenance=True)
+    assert "provenance" not in df_products.attrs
+
+    # Every count is explained by as many contributions
+    for row in range(len(df_products) - 2):
+        for column in df_products.columns[2:-2]:
+            count = df_products.iloc[row][column]
+            count = 0 if pandas.isna(count) else count
+            assert len(provenance.rows(row, column)) == count
+
+    # Duplicate names resolve to the first response, as in the counts
+    hoodie = df_products.index[
+        df_products["Product Name"] == "Unisex EcoLayer Hoodie - 2 Personalisations"
+    ][0]
+    assert list(provenance.rows(hoodie, "M")) == [0, 0]
+    assert len(provenance.rows(len(df_products) - 2, "Total Quantity")) == 8
+    assert len(provenance.rows(len(df_products) - 2)) == 8
+    assert list(provenance.rows(hoodie)) == [0, 0]
+
+    df_personal, provenance = plkit.generate_product_personalisations(
+        df_orders, start="2025-01-01 01:00", provenance=True
+    )
+    # Rows keep the labels of df_orders, the repeat of John Smith is too early
+    assert [list(provenance.rows(i)) for i in range(len(df_personal))] == [
+        [1],
+        [1],
+        [2],
+    ]
+    with pytest.raises(LookupError):
+        provenance.rows(len(df_personal))
@@ -0,0 +1,61 @@
+import pandas
+
+import plkit
+
+
+def test_reconcile_invoice(df_orders):
+    df_products = plkit.generate_product_order(df_orders)
+
+    df_invoice = pandas.DataFrame(
+        [
+            ("Unisex EcoLayer Hoodie - 2 Personalisations", "M", 1, 46.80),
+            ("Men's EcoLayer Tee (Green)", "l", 1, 18.60),
+            ("Women's EcoLayer Tee (Navy) - 1 Personalisation", "8", 1, 22.80),
+            ("Women's Sublimated Tee - 1 Personalisation (Green)", 14, 1, 25.62),
+            # Short-delivered, overcharged and not ordered
+            ("Unisex Shield Performance Sweatshirt", "2XL", 2, 36.0),
+            ("Men's Sublimated Tee - 2 Personalisations (Navy)", "XS", 1, 26.62),
+            ("Unisex EcoLayer Hoodie", "S", 1, 38.40),
+        ],
+        columns=["Item", "Size", "Qty", "Unit Price (£)"],
+    )
+
+    df_reconciled = plkit.reconcile_invoice(
+        df_invoice, df_products, columns={"Product": "Item", "Quantity": "Qty"}
+    )
+
+    # Rows follow the product order
+    assert list(df_reconciled["Status"]) == [
+        "not ordered",
+        "ok",
+        "quantity mismatch",
+        "ok",
+        "ok",
+        "price mismatch",
+        "ok",
+    ]
+    assert list(df_reconciled["Colour"]).count("Forest") == 2
+    assert list(df_reconciled["Size"]) == ["S", "M", "2XL", "L", 8, "XS", 14]
+    assert list(df_reconciled["Price Difference (£)"]) == [38.4, 0, 36.0, 0, 0, 1.0, 0]
+
+
+def test_reconcile_invoice_prices(df_orders, tmp_cwd):
+    df_products = plkit.generate_product_order(df_orders)
+
+    pandas.DataFrame(
+        [
+            ("Unisex EcoLayer Hoodie - 2 Personalisations", "M", "1", "£46.80"),
+            ("Men's EcoLayer Tee (Green)", "L", "1", " £ 18.60 "),
+            ("Unisex Shield Performance Sweatshirt", "2XL", "1", "TBC"),
+        ],
+        columns=["Product", "Size", "Quantity", "Unit Price (£)"],
+    ).to_csv("invoice.csv", index=False)
+
+    df_reconciled = plkit.reconcile_invoice("invoice.csv", df_products)
+    status = dict(
+        zip(df_reconciled["Product Name"], df_reconciled["Status"], strict=True)
+    )
+
+    assert status["Unisex EcoLayer Hoodie - 2 Personalisations"] == "ok"
+    assert status["Men's EcoLayer Tee"] == "ok"
+    assert status["Unisex Shield Performance Sweatshirt"] == "unreadable"
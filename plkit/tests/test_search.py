@@ -0,0 +1,47 @@
+import pytest
+
+import plkit
+from plkit.search import get_search_index
+
+
+def test_search_orders(df_orders):
+    df_matches = plkit.search_orders(df_orders, "Jon Smith")
+    assert df_matches["Name"].iloc[0] == "John Smith"
+
+    df_matches = plkit.search_orders(df_orders, "jane.doe@ed.ac.uj")
+    assert df_matches["Row"].iloc[0] == 1
+
+    assert get_search_index(df_orders) is get_search_index(df_orders)
+
+
+def test_read_order_fuzzy(df_orders):
+    with pytest.raises(LookupError, match="Did you mean: John Smith"):
+        plkit.read_order(df_orders, "Jon Smith")
+
+    order = plkit.read_order(df_orders, "Jon Smith", fuzzy=True)
+    assert order.email == "john.smith@ed.ac.uk"
+
+
+def test_search_index_invalidated(df_orders):
+    index = get_search_index(df_orders)
+
+    df_orders.loc[1, "Email"] = "jane@ed.ac.uk"
+    assert get_search_index(df_orders) is not index
+    assert plkit.search_orders(df_orders, "jane@ed.ac.uk")["Row"].iloc[0] == 1
+
+    index = get_search_index(df_orders)
+    df_orders.loc[0, "ID"] = 10  # other columns do not invalidate the index
+    assert get_search_index(df_orders) is index
+
+    df_orders.rename(columns={"Name": "Email", "Email": "Name"}, inplace=True)
+    assert get_search_index(df_orders) is not index
+
+
+def test_search_index_invalidated_without_copy_on_write(df_orders, monkeypatch):
+    # pandas 2 without copy on write changes columns in place
+    monkeypatch.setattr(plkit.search, "_copy_on_write", lambda: False)
+    index = get_search_index(df_orders)
+
+    assert get_search_index(df_orders) is index
+    df_orders.loc[1, "Email"] = "jane@ed.ac.uk"
+    assert get_search_index(df_orders) is not index
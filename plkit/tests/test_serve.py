@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from plkit.serve import OrderIndex, make_server
+
+
+@pytest.fixture()
+def index(df_orders, tmp_cwd):
+    df_orders.to_excel("responses.xlsx", index=False)
+    return OrderIndex("responses.xlsx")
+
+
+def test_order_index_reload(index, df_orders):
+    assert index.n_parsed == len(df_orders)
+    jane = index.lookup(name="jane doe")[0]
+    assert jane["price"] == pytest.approx(22.80 + 25.62 + 36.0)
+
+    df_orders.loc[0, "First kit item"] = "Unisex Shield Performance Sweatshirt"
+    df_orders.to_excel("responses.xlsx", index=False)
+    os.utime("responses.xlsx", ns=(0, 10**18))
+
+    assert index.reload()
+    assert index.lookup(email="JOHN.SMITH@ed.ac.uk")[0]["products"][0] == (
+        "Unisex Shield Performance Sweatshirt - 2 Personalisations"
+    )
+    # Unchanged rows are not re-parsed
+    assert index.n_parsed == 1
+    assert index.lookup(name="Jane Doe")[0]["products"] == jane["products"]
+    assert not index.reload()
+
+
+def test_server(index):
+    server = make_server(index, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        with urllib.request.urlopen(f"{url}/price?email=alex.brown@ed.ac.uk") as r:
+            assert json.load(r) == [
+                {"name": "Alex Brown", "email": "alex.brown@ed.ac.uk", "price": 25.62}
+            ]
+
+        with urllib.request.urlopen(f"{url}/products") as r:
+            products = {p["product"]: p["total_quantity"] for p in json.load(r)}
+            assert products["Unisex EcoLayer Hoodie - 2 Personalisations"] == 1
+
+        with pytest.raises(urllib.error.HTTPError, match="404"):
+            urllib.request.urlopen(f"{url}/orders?name=Nobody")
+    finally:
+        server.shutdown()
+        server.server_close()
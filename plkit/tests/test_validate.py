@@ -0,0 +1,64 @@
+import numpy
+
+import plkit
+
+from .helpers import make_orders
+
+
+def test_validate_orders_clean(df_orders):
+    df_violations = plkit.validate_orders(df_orders)
+
+    assert len(df_violations) == 0
+    assert list(df_violations.columns) == ["Row", "Slot", "Rule", "Value"]
+
+
+def test_validate_orders_collects_all_violations():
+    nan = numpy.nan
+    df_orders = make_orders(
+        [
+            (
+                "John Smith",
+                "john.smith@ed.ac.uk",
+                [
+                    ("Unisex EcoLayer Hoodie", "6XL", nan, "ABC"),
+                    ("Unisex Fleece", "M", nan, nan),
+                    (nan, nan, "SMITH", nan),
+                ],
+            ),
+            (
+                "Jane Doe",
+                "jane.doe@ed.ac.uk",
+                [("Men's EcoLayer Tee (Green)", nan, nan, "J1")],
+            ),
+        ]
+    )
+
+    df_violations = plkit.validate_orders(df_orders)
+
+    assert list(df_violations.itertuples(index=False, name=None)) == [
+        (0, 1, "unknown_size", "6XL"),
+        (0, 1, "initials_too_long", "ABC"),
+        (0, 2, "unknown_item", "Unisex Fleece"),
+        (0, 3, "orphan_back_name", "SMITH"),
+        (1, 1, "missing_size", nan),
+        (1, 1, "initials_not_letters", "J1"),
+    ]
+
+
+def test_validate_orders_numeric_initials():
+    # Excel reads initials such as 12 as a number
+    df_orders = make_orders(
+        [
+            (
+                "John Smith",
+                "john.smith@ed.ac.uk",
+                [("Unisex EcoLayer Hoodie", "M", "SMITH", 12)],
+            )
+        ]
+    )
+
+    df_violations = plkit.validate_orders(df_orders)
+
+    assert list(df_violations.itertuples(index=False, name=None)) == [
+        (0, 1, "initials_not_letters", 12)
+    ]
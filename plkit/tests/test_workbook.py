@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+import plkit
+from plkit._catalogue import SIZING_COLUMNS
+from plkit._cli import main
+
+
+@pytest.mark.parametrize("filename", ["responses.xlsx", "responses.csv"])
+def test_inspect_workbook(df_orders, tmp_cwd, filename):
+    df_orders = df_orders.rename(
+        columns={"Name": "name ", SIZING_COLUMNS[2]: SIZING_COLUMNS[2] + "!"}
+    )
+    df_orders = df_orders.drop(columns=["Email"])
+
+    if filename.endswith(".csv"):
+        df_orders.to_csv(filename, index=False)
+    else:
+        df_orders.to_excel(filename, index=False, sheet_name="Form1")
+
+    report = plkit.inspect_workbook(filename)
+
+    assert report["sheet"] == (None if filename.endswith(".csv") else "Form1")
+    assert report["rows"] == len(df_orders)
+    assert report["columns"] == list(df_orders.columns)
+    assert report["missing"] == ["Name", "Email", SIZING_COLUMNS[2]]
+    assert report["renamed"] == {
+        "Name": "name ",
+        SIZING_COLUMNS[2]: SIZING_COLUMNS[2] + "!",
+    }
+    assert report["extra"] == ["ID", "Completion time"]
+
+    result = CliRunner().invoke(main, ["inspect", filename])
+    assert result.exit_code == 1
+    assert "Missing: Name (renamed to name ?)" in result.output
+    assert "Missing: Email\n" in result.output
+
+
+def test_inspect_cli(df_orders, tmp_cwd):
+    df_orders.to_excel("responses.xlsx", index=False)
+
+    result = CliRunner().invoke(main, ["inspect", "responses.xlsx"])
+
+    assert result.exit_code == 0, result.output
+    assert "Responses: 3" in result.output
+    assert "Missing" not in result.output
+
+
+def test_inspect_does_not_import_pandas():
+    code = "import sys, plkit.workbook; assert 'pandas' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -10,6 +10,8 @@ from .tests import assert_order_count
 from .tests import assert_back_personalisations
 from .tests import assert_sleeve_personalisations
 
+from .rules import validate_orders
+
 __all__ = [
     "count_initial_order",
     "count_initial_back_personalisations",
@@ -20,4 +22,5 @@ __all__ = [
     "assert_order_count",
     "assert_back_personalisations",
     "assert_sleeve_personalisations",
+    "validate_orders",
 ]
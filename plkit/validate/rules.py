@@ -0,0 +1,144 @@
+"""Rule-based validation of the raw order responses before processing"""
+
+import pandas as _pd
+
+from .._catalogue import BACK_NAME_COLUMNS as _BACK_NAME_COLUMNS
+from .._catalogue import BASE_PRODUCTS as _BASE_PRODUCTS
+from .._catalogue import ITEM_COLUMNS as _ITEM_COLUMNS
+from .._catalogue import SIZES as _SIZES
+from .._catalogue import SIZING_COLUMNS as _SIZING_COLUMNS
+from .._catalogue import SLEEVE_NAME_COLUMNS as _SLEEVE_NAME_COLUMNS
+from .._catalogue import product_name as _product_name
+
+# Rules checked by validate_orders(), in the order they are reported
+RULES = {
+    "unknown_item": "Kit item is not in the product catalogue",
+    "missing_size": "Kit item has no sizing",
+    "unknown_size": "Sizing is not one of XS, S, ..., 5XL",
+    "orphan_size": "Sizing given for an empty item slot",
+    "orphan_back_name": "Back name personalisation given for an empty item slot",
+    "orphan_initials": "Initials personalisation given for an empty item slot",
+    "initials_too_long": "Initials personalisation is longer than two letters",
+    "initials_not_letters": "Initials personalisation contains non-letter characters",
+}
+
+_COLUMNS = ["Row", "Slot", "Rule", "Value"]
+
+
+def _as_text(column: _pd.Series) -> _pd.Series:
+    """Internal function to allow the .str accessor on columns which pandas
+    has read as numeric, e.g. an item slot left empty by every respondent,
+    by keeping only the cells holding strings"""
+    is_string = column.map(lambda value: isinstance(value, str)).astype(bool)
+    return column.astype(object).where(is_string)
+
+
+def _known_items(items: _pd.Series) -> list:
+    """Internal function to list the distinct item strings which resolve
+    to a product in the catalogue"""
+    known = []
+
+    for item in _pd.unique(items.dropna()):
+        if isinstance(item, str) and _product_name(item.strip(), 0) in _BASE_PRODUCTS:
+            known.append(item)
+
+    return known
+
+
+def _slot_violations(df_orders: _pd.DataFrame, slot: int) -> dict:
+    """Internal function to build a boolean mask and value column for
+    every rule for a single item slot"""
+
+    items = df_orders[_ITEM_COLUMNS[slot]]
+    sizings = df_orders[_SIZING_COLUMNS[slot]]
+    back_names = df_orders[_BACK_NAME_COLUMNS[slot]]
+    sleeve_names = df_orders[_SLEEVE_NAME_COLUMNS[slot]]
+
+    has_item = items.notna()
+    has_sizing = sizings.notna()
+
+    # Non-string cells, e.g. initials read by Excel as a number, become NaN
+    # and therefore fail the isin and letter checks
+    clean_sizings = _as_text(sizings).str.strip().str.upper()
+    clean_initials = _as_text(sleeve_names).str.strip()
+    has_initials = sleeve_names.notna()
+
+    return {
+        "unknown_item": (has_item & ~items.isin(_known_items(items)), items),
+        "missing_size": (has_item & ~has_sizing, sizings),
+        "unknown_size": (
+            has_item & has_sizing & ~clean_sizings.isin(_SIZES),
+            sizings,
+        ),
+        "orphan_size": (~has_item & has_sizing, sizings),
+        "orphan_back_name": (~has_item & back_names.notna(), back_names),
+        "orphan_initials": (~has_item & sleeve_names.notna(), sleeve_names),
+        "initials_too_long": (
+            has_initials & (clean_initials.str.len() > 2),
+            sleeve_names,
+        ),
+        "initials_not_letters": (
+            has_initials
+            & ~clean_initials.str.fullmatch(r"[^\W\d_]*").fillna(False).astype(bool),
+            sleeve_names,
+        ),
+    }
+
+
+def validate_orders(df_orders: _pd.DataFrame) -> _pd.DataFrame:
+    """
+    Check every item slot of the order responses against the input rules,
+    collecting all violations rather than stopping at the first one.
+
+    Parameters
+    ----------
+    df_orders: pd.DataFrame
+        The order details converted to a pandas DataFrame
+
+    Returns
+    -------
+    df_violations: pd.DataFrame
+        One row per violation with the row label in df_orders, the item
+        slot (1-5), the name of the rule broken (see RULES) and the
+        offending value. Empty if every rule is satisfied.
+    """
+
+    for columns in [
+        _ITEM_COLUMNS,
+        _SIZING_COLUMNS,
+        _BACK_NAME_COLUMNS,
+        _SLEEVE_NAME_COLUMNS,
+    ]:
+        for column_name in columns:
+            if column_name not in df_orders.columns:
+                raise LookupError(f"Column {column_name} not found in input DataFrame")
+
+    violations = []
+
+    for slot in range(len(_ITEM_COLUMNS)):
+        masks = _slot_violations(df_orders, slot)
+
+        for rule in RULES:
+            mask, values = masks[rule]
+            mask = mask.to_numpy(dtype=bool, na_value=False)
+
+            if mask.any():
+                violations.append(
+                    _pd.DataFrame(
+                        {
+                            "Row": df_orders.index[mask],
+                            "Slot": slot + 1,
+                            "Rule": rule,
+                            "Value": values[mask].to_numpy(dtype=object),
+                        }
+                    )
+                )
+
+    if not violations:
+        return _pd.DataFrame(columns=_COLUMNS)
+
+    df_violations = _pd.concat(violations, ignore_index=True)
+
+    return df_violations.sort_values(["Row", "Slot"], kind="stable").reset_index(
+        drop=True
+    )
@@ -0,0 +1,125 @@
+"""
+Quick inspection of an export of the Microsoft form, checking that it has the
+columns plkit needs before it is read in full. Only the header row and the
+sheet dimensions are read, and pandas is not imported.
+"""
+
+import csv as _csv
+import difflib as _difflib
+import os as _os
+
+from ._catalogue import ORDER_COLUMNS as _ORDER_COLUMNS
+from ._catalogue import clean_string as _clean_string
+
+# Columns read by extract_orders() and read_order()
+REQUIRED_COLUMNS = _ORDER_COLUMNS
+
+# Minimum similarity for a header to be reported as a renamed column
+_RENAME_CUTOFF = 0.8
+
+
+def _header_key(header) -> str:
+    """Internal function to normalise a header for comparison, ignoring
+    case, hidden characters and repeated whitespace"""
+    return " ".join(_clean_string(str(header)).split()).casefold()
+
+
+def _read_xlsx_header(filename: str) -> tuple:
+    """Internal function to read the header row and the number of rows of
+    the first sheet of an Excel workbook, streaming it in read-only mode"""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+
+    try:
+        sheet = workbook.worksheets[0]
+        header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+
+        # The dimensions are stored at the top of the sheet, but may be
+        # missing from workbooks not written by Excel
+        n_rows = sheet.max_row
+        if n_rows is None:
+            n_rows = sum(1 for _ in sheet.iter_rows(values_only=True))
+
+        return sheet.title, list(header), n_rows
+    finally:
+        workbook.close()
+
+
+def _read_csv_header(filename: str) -> tuple:
+    """Internal function to read the header row and the number of rows of a
+    CSV file"""
+    with open(filename, newline="", encoding="utf-8-sig") as f:
+        reader = _csv.reader(f)
+        header = next(reader, [])
+        n_rows = sum(1 for _ in reader) + (1 if header else 0)
+
+    return None, header, n_rows
+
+
+def inspect_workbook(filename: str = "responses.xlsx") -> dict:
+    """
+    Check that an export of the order response form has the columns needed
+    by extract_orders(), without reading the responses themselves.
+
+    Excel workbooks are opened in read-only mode and only the header row and
+    the sheet dimensions are read, so inspection takes the same time however
+    many responses there are. CSV files are scanned once to count the rows.
+
+    Parameters
+    ----------
+    filename : str, optional
+        The name of the excel or CSV responses form
+
+    Returns
+    -------
+    report : dict
+        The "sheet" name (None for CSV files), the number of response
+        "rows", the "columns" in the header, the required columns which are
+        "missing", the likely "renamed" columns as a dictionary from each
+        missing column to the closest header, and the "extra" headers not
+        used by plkit
+    """
+
+    if not filename.endswith((".xlsx", ".csv")):
+        raise ValueError("Input must be an Excel or CSV File")
+
+    if not _os.path.isfile(filename):
+        raise FileNotFoundError(f"File {filename} does not exist")
+
+    if filename.endswith(".csv"):
+        sheet, header, n_rows = _read_csv_header(filename)
+    else:
+        sheet, header, n_rows = _read_xlsx_header(filename)
+
+    columns = [column for column in header if column is not None]
+
+    present = set(columns)
+    missing = [column for column in REQUIRED_COLUMNS if column not in present]
+
+    # Match each missing column to an unused header, first ignoring case and
+    # hidden characters, then by similarity
+    extra = [column for column in columns if column not in REQUIRED_COLUMNS]
+    keys = {}
+    for column in extra:
+        keys.setdefault(_header_key(column), column)
+
+    renamed = {}
+    for column in missing:
+        key = _header_key(column)
+        if key not in keys:
+            matches = _difflib.get_close_matches(key, keys, n=1, cutoff=_RENAME_CUTOFF)
+            key = matches[0] if matches else None
+
+        if key is not None:
+            renamed[column] = keys.pop(key)
+
+    return {
+        "sheet": sheet,
+        "rows": max(n_rows - 1, 0),
+        "columns": columns,
+        "missing": missing,
+        "renamed": renamed,
+        "extra": [column for column in extra if column not in renamed.values()],
+    }
+